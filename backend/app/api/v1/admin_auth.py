@@ -1,27 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from jose import jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import time
-from app.services.auth_service import create_admin_tokens, verify_password, get_current_admin, oauth2_scheme
-from app.core.postgres_client import get_db
+from app.services.auth_service import (
+    create_admin_tokens, verify_password, get_password_hash, password_needs_rehash,
+    get_current_admin, oauth2_scheme, run_password_op
+)
+from app.core.postgres_client import get_async_db
 from app.models.admin import Admin
 from app.schemas.user import Token, AdminUser
 from app.core.config import get_settings
-from slowapi import Limiter
-from app.core.rate_limit import get_admin_user_identifier
+from app.core.rate_limit import admin_rate_limit
 
 settings = get_settings()
-limiter = Limiter(key_func=get_admin_user_identifier)  # Per-user rate limiting
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
-@router.post("/login", response_model=Token)
-@limiter.limit(settings.ADMIN_RATE_LIMIT, key_func=get_admin_user_identifier)
+@router.post("/login", response_model=Token, dependencies=[Depends(admin_rate_limit)])  # Per-user rate limiting
 async def admin_login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Admin login endpoint.
@@ -30,7 +30,8 @@ async def admin_login(
     Returns JWT access and refresh tokens on successful login.
     """
     # Query admin from Postgres
-    admin = db.query(Admin).filter(Admin.username == form_data.username).first()
+    result = await db.execute(select(Admin).where(Admin.username == form_data.username))
+    admin = result.scalar_one_or_none()
     
     if not admin:
         raise HTTPException(
@@ -39,8 +40,9 @@ async def admin_login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password
-    if not verify_password(form_data.password, admin.hashed_password):
+    # Verify password (hashing is CPU/memory-bound; runs on the bounded password pool)
+    password_ok = await run_password_op(verify_password, form_data.password, admin.hashed_password)
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -54,12 +56,16 @@ async def admin_login(
             detail="Admin account is deactivated",
         )
     
+    # Upgrade legacy bcrypt / outdated argon2 hashes while we hold the plaintext
+    if password_needs_rehash(admin.hashed_password):
+        admin.hashed_password = await run_password_op(get_password_hash, form_data.password)
+        await db.commit()
+    
     # Create tokens
     access_token, refresh_token = create_admin_tokens(admin.username)
     return Token(access_token=access_token, refresh_token=refresh_token)
 
-@router.post("/logout")
-@limiter.limit(settings.ADMIN_RATE_LIMIT, key_func=get_admin_user_identifier)
+@router.post("/logout", dependencies=[Depends(admin_rate_limit)])
 async def admin_logout(
     request: Request,
     current_admin: AdminUser = Depends(get_current_admin),
@@ -77,7 +83,7 @@ async def admin_logout(
         
         # Blocklist token via AuthService
         auth_service = get_auth_service()
-        auth_service.blocklist_token(token)
+        await auth_service.revoke_admin_token(token)
         
         return {"message": "Logged out successfully"}
     except Exception as e:
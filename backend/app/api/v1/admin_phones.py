@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.core.postgres_client import get_db
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.postgres_client import get_async_db
+from app.core.redis_client import get_async_redis
+from app.core.dependencies import json_body
 from app.services.auth_service import get_current_admin
 from app.schemas.user import AdminUser
-from app.schemas.phone import PhoneReport
+from app.schemas.phone import PhoneReport, PhoneReportBulkAction
 from app.services.phone_service import list_reports, approve_report, reject_report, delete_report, get_stats, search_phone_report  # Thêm search
+from app.services.phone_service import approve_reports, reject_reports, delete_reports
+from app.services.phone_service import PHONE_LOOKUP_TTL, PHONE_STATS_KEY, PHONE_STATS_TTL, phone_lookup_key, encode_list_cursor, decode_list_cursor
 
 router = APIRouter(prefix="/admin", tags=["admin-phones"])
 
@@ -13,42 +20,93 @@ from app.models.phone_report import ReportStatus
 
 @router.get("/phones", response_model=dict)
 async def list_phone_reports(
-    skip: int = 0,
-    limit: int = 20,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
     status: Optional[ReportStatus] = None,
     phone_number: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces skip"),
     admin: AdminUser = Depends(get_current_admin), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    items, total = list_reports(db, skip=skip, limit=limit, status=status, phone_number=phone_number)
-    return {"items": items, "total": total}
+    try:
+        keyset = decode_list_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    items, total = await list_reports(db, skip=skip, limit=limit, status=status, phone_number=phone_number, cursor=keyset)
+    next_cursor = None
+    if len(items) == limit and items[-1]["created_at"] is not None:
+        next_cursor = encode_list_cursor(items[-1]["created_at"], items[-1]["id"])
+    # Rows are exactly the PhoneReport columns from Postgres: serialize them as-is
+    # instead of validating each one and re-encoding through jsonable_encoder
+    return ORJSONResponse({"items": [dict(item) for item in items], "total": total, "next_cursor": next_cursor})
+
+async def _invalidate_lookups(r: Redis, phone_numbers: list) -> None:
+    if phone_numbers:
+        await r.delete(*{phone_lookup_key(n) for n in phone_numbers})
+
+# Bulk routes are declared before /phones/{report_id}/... so "bulk" isn't read as an ID
+@router.post("/phones/bulk/approve", response_model=dict)
+async def bulk_approve_phone_reports(body: PhoneReportBulkAction = Depends(json_body(PhoneReportBulkAction)), admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    phone_numbers = await approve_reports(db, body.ids)
+    await _invalidate_lookups(r, phone_numbers)
+    return {"updated": len(phone_numbers)}
+
+@router.post("/phones/bulk/reject", response_model=dict)
+async def bulk_reject_phone_reports(body: PhoneReportBulkAction = Depends(json_body(PhoneReportBulkAction)), admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    phone_numbers = await reject_reports(db, body.ids, body.note or "")
+    await _invalidate_lookups(r, phone_numbers)
+    return {"updated": len(phone_numbers)}
+
+@router.post("/phones/bulk/delete", response_model=dict)
+async def bulk_delete_phone_reports(body: PhoneReportBulkAction = Depends(json_body(PhoneReportBulkAction)), admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    phone_numbers = await delete_reports(db, body.ids)
+    await _invalidate_lookups(r, phone_numbers)
+    return {"deleted": len(phone_numbers)}
 
 @router.post("/phones/{report_id}/approve", response_model=PhoneReport)
-async def approve_phone_report(report_id: int, admin: AdminUser = Depends(get_current_admin), db: Session = Depends(get_db)):
-    report = approve_report(db, report_id)
+async def approve_phone_report(report_id: int, admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    report = await approve_report(db, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+    await r.delete(phone_lookup_key(report.phone_number))
     return report
 
 @router.post("/phones/{report_id}/reject", response_model=PhoneReport)
-async def reject_phone_report(report_id: int, note: str = Query(None), admin: AdminUser = Depends(get_current_admin), db: Session = Depends(get_db)):
-    report = reject_report(db, report_id, note)
+async def reject_phone_report(report_id: int, note: str = Query(None), admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    report = await reject_report(db, report_id, note)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
+    await r.delete(phone_lookup_key(report.phone_number))
     return report
 
 @router.delete("/phones/{report_id}", status_code=204)
-async def delete_phone_report(report_id: int, admin: AdminUser = Depends(get_current_admin), db: Session = Depends(get_db)):
-    deleted = delete_report(db, report_id)
+async def delete_phone_report(report_id: int, admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    deleted = await delete_report(db, report_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Report not found")
+    await r.delete(phone_lookup_key(deleted.phone_number))
 
 @router.get("/phones/stats", response_model=dict)
-async def phone_report_stats(admin: AdminUser = Depends(get_current_admin), db: Session = Depends(get_db)):
-    return get_stats(db)
+async def phone_report_stats(admin: AdminUser = Depends(get_current_admin), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
+    # Cache-aside: stats may lag writes by up to PHONE_STATS_TTL seconds
+    cached = await r.get(PHONE_STATS_KEY)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    stats = await get_stats(db)
+    await r.set(PHONE_STATS_KEY, orjson.dumps(stats), ex=PHONE_STATS_TTL)
+    return stats
 
 # Thêm API search phone (public, cho app query)
 @router.get("/phones/search", response_model=PhoneReport | None)
-async def search_phone(phone_number: str = Query(...), db: Session = Depends(get_db)):
+async def search_phone(phone_number: str = Query(...), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
     """API public để app query sđt có report không"""
-    return search_phone_report(db, phone_number)
\ No newline at end of file
+    # Cache-aside: "null" caches a miss so unknown numbers don't hit Postgres either
+    key = phone_lookup_key(phone_number)
+    cached = await r.get(key)
+    if cached is not None:
+        return None if cached == "null" else PhoneReport.model_validate_json(cached)
+
+    report = await search_phone_report(db, phone_number)
+    result = PhoneReport.model_validate(report) if report else None
+    await r.set(key, result.model_dump_json() if result else "null", ex=PHONE_LOOKUP_TTL)
+    return result
\ No newline at end of file
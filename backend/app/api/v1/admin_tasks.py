@@ -1,54 +1,64 @@
 # app/api/v1/admin_tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from redis import Redis
-from app.core.redis_client import get_redis
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from redis.asyncio import Redis
+from app.core.redis_client import get_async_redis, async_redis_client
 from app.services.auth_service import get_current_admin
 from app.schemas.user import AdminUser
-from app.services.queue_service import requeue_all_failed, requeue_task
+from app.services.queue_service import list_tasks_async, requeue_all_failed_async, requeue_task_async
 
 router = APIRouter(prefix="/admin", tags=["admin-tasks"])
 
+# Dashboards poll queue stats; serve them from memory for a second (per process).
+STATS_CACHE_TTL = 1.0
+_stats_cache = {"t": 0.0, "v": None}
+_stats_lock = asyncio.Lock()
+
 @router.get("/tasks")
 async def list_tasks(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
     status: str = None,
-    admin: AdminUser = Depends(get_current_admin),
-    r: Redis = Depends(get_redis)
+    admin: AdminUser = Depends(get_current_admin)
 ):
     """
     List tasks from the queue.
     """
-    from app.services.queue_service import get_queue_service
-    queue_service = get_queue_service()
-    return queue_service.list_tasks(limit=limit, status=status)
+    return await list_tasks_async(limit=limit, status=status, offset=offset)
 
 @router.get("/queue/stats")
-async def queue_stats(
-    admin: AdminUser = Depends(get_current_admin),
-    r: Redis = Depends(get_redis)
-):
+async def queue_stats(admin: AdminUser = Depends(get_current_admin)):
     """
     Get queue statistics
 
     Returns the count of tasks in pending, processing, and failed queues.
-    Requires admin authentication.
+    Requires admin authentication. Cached for STATS_CACHE_TTL seconds.
     """
-    try:
-        pipe = r.pipeline()
-        pipe.llen("queue:pending")
-        pipe.zcard("queue:processing")
-        pipe.zcard("queue:failed")
-        res = pipe.execute()
-        return {
+    if time.monotonic() - _stats_cache["t"] < STATS_CACHE_TTL:
+        return _stats_cache["v"]
+    async with _stats_lock:
+        # Another request may have refreshed while we waited
+        if time.monotonic() - _stats_cache["t"] < STATS_CACHE_TTL:
+            return _stats_cache["v"]
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.llen("queue:pending")
+                pipe.zcard("queue:processing")
+                pipe.zcard("queue:failed")
+                res = await pipe.execute()
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch queue stats: {str(e)}"
+            )
+        _stats_cache["v"] = {
             "pending": res[0],
             "processing": res[1],
             "failed": res[2]
         }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch queue stats: {str(e)}"
-        )
+        _stats_cache["t"] = time.monotonic()
+        return _stats_cache["v"]
 
 @router.post("/tasks/retry-all-failed")
 async def retry_all(admin: AdminUser = Depends(get_current_admin)):
@@ -59,7 +69,7 @@ async def retry_all(admin: AdminUser = Depends(get_current_admin)):
     Requires admin authentication.
     """
     try:
-        count = requeue_all_failed()
+        count = await requeue_all_failed_async()
         return {"requeued": count, "message": f"Successfully requeued {count} tasks"}
     except Exception as e:
         raise HTTPException(
@@ -71,7 +81,7 @@ async def retry_all(admin: AdminUser = Depends(get_current_admin)):
 async def retry_one(
     task_id: str,
     admin: AdminUser = Depends(get_current_admin),
-    r: Redis = Depends(get_redis)
+    r: Redis = Depends(get_async_redis)
 ):
     """
     Retry a specific failed task
@@ -79,13 +89,13 @@ async def retry_one(
     Requeues a single task from the failed queue back to pending.
     Requires admin authentication.
     """
-    if not r.zscore("queue:failed", task_id):
+    if await r.zscore("queue:failed", task_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found in failed queue"
         )
     try:
-        requeue_task(task_id)
+        await requeue_task_async(task_id)
         return {"message": "Task requeued successfully", "task_id": task_id}
     except Exception as e:
         raise HTTPException(
@@ -1,57 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any
 
-from app.core.postgres_client import get_db
-from app.services.auth_service import get_current_admin, AuthService, get_auth_service
+from app.core.postgres_client import get_async_db
+from app.services.auth_service import get_current_admin, AuthService, get_auth_service, run_password_op
 from app.models.admin import Admin
 from app.schemas.user import AdminUser, AdminCreate, AdminResponse, AdminUpdate
 
 router = APIRouter(prefix="/admin", tags=["admin-users"])
 
+# Built once: validates/serializes the whole list in one pydantic-core call
+_admin_list_adapter = TypeAdapter(List[AdminResponse])
+
 @router.get("/users", response_model=List[AdminResponse])
 async def list_admins(
     current_admin: AdminUser = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all admin users. Only superusers can see this."""
     # In a real app, check if current_admin is superuser
-    admins = db.query(Admin).all()
-    return admins
+    # Only the columns AdminResponse exposes (never hashed_password), no ORM hydration
+    result = await db.execute(
+        select(Admin.id, Admin.username, Admin.email, Admin.full_name, Admin.is_active, Admin.is_superuser)
+    )
+    rows = _admin_list_adapter.validate_python(result.mappings().all())
+    return Response(content=_admin_list_adapter.dump_json(rows), media_type="application/json")
 
 @router.post("/users", response_model=AdminResponse, status_code=status.HTTP_201_CREATED)
 async def create_admin(
     admin_in: AdminCreate,
     current_admin: AdminUser = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new admin user."""
     auth_service = get_auth_service()
     
-    # Check if exists
-    existing = db.query(Admin).filter((Admin.username == admin_in.username) | (Admin.email == admin_in.email)).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Username or email already exists")
-    
-    hashed_password = auth_service.hash_password(admin_in.password)
-    new_admin = Admin(
-        username=admin_in.username,
-        email=admin_in.email,
-        hashed_password=hashed_password,
-        full_name=admin_in.full_name,
-        is_active=True,
-        is_superuser=False # Default to false for created admins
+    hashed_password = await run_password_op(auth_service.hash_password, admin_in.password)
+    # Single round trip: conflicts on the username or email unique constraints insert nothing
+    stmt = (
+        insert(Admin)
+        .values(
+            username=admin_in.username,
+            email=admin_in.email,
+            hashed_password=hashed_password,
+            full_name=admin_in.full_name,
+            is_active=True,
+            is_superuser=False # Default to false for created admins
+        )
+        .on_conflict_do_nothing()
+        .returning(Admin)
     )
-    db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    new_admin = (await db.execute(stmt)).scalar_one_or_none()
+    if new_admin is None:
+        raise HTTPException(status_code=400, detail="Username or email already exists")
+    await db.commit()
     return new_admin
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_admin(
     user_id: int,
     current_admin: AdminUser = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an admin user."""
     # Prevent deleting self
@@ -59,35 +72,31 @@ async def delete_admin(
     # But AdminUser schema might not have ID if it came from token payload which usually has 'sub' as username.
     # Let's assume we can't easily check ID without querying DB for current admin, but we can check username if we had it.
     
-    admin_to_delete = db.query(Admin).filter(Admin.id == user_id).first()
+    admin_to_delete = await db.get(Admin, user_id)
     if not admin_to_delete:
         raise HTTPException(status_code=404, detail="User not found")
         
     if admin_to_delete.username == current_admin.username:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
         
-    db.delete(admin_to_delete)
-    db.commit()
+    await db.delete(admin_to_delete)
+    await db.commit()
 
 @router.put("/users/{user_id}", response_model=AdminResponse)
 async def update_admin(
     user_id: int,
     admin_in: AdminUpdate,
     current_admin: AdminUser = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an admin user."""
-    admin_to_update = db.query(Admin).filter(Admin.id == user_id).first()
+    admin_to_update = await db.get(Admin, user_id)
     if not admin_to_update:
         raise HTTPException(status_code=404, detail="User not found")
         
     # Update fields
     if admin_in.email is not None:
-        # Check uniqueness if email changed
-        if admin_in.email != admin_to_update.email:
-            existing = db.query(Admin).filter(Admin.email == admin_in.email).first()
-            if existing:
-                raise HTTPException(status_code=400, detail="Email already exists")
+        # Uniqueness is enforced by the admins.email unique constraint on commit
         admin_to_update.email = admin_in.email
         
     if admin_in.full_name is not None:
@@ -108,11 +117,14 @@ async def update_admin(
         if admin_to_update.username == current_admin.username:
             if not admin_in.current_password:
                 raise HTTPException(status_code=400, detail="Current password is required to change password")
-            if not auth_service.verify_password(admin_in.current_password, admin_to_update.hashed_password):
+            if not await run_password_op(auth_service.verify_password, admin_in.current_password, admin_to_update.hashed_password):
                 raise HTTPException(status_code=400, detail="Incorrect current password")
         
-        admin_to_update.hashed_password = auth_service.hash_password(admin_in.password)
+        admin_to_update.hashed_password = await run_password_op(auth_service.hash_password, admin_in.password)
         
-    db.commit()
-    db.refresh(admin_to_update)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already exists")
     return admin_to_update
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from redis import Redis
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
 import uuid
 import datetime
-from app.core.redis_client import get_redis
+from app.core.redis_client import get_async_redis
 from app.services.auth_service import get_current_admin, create_worker_token, hash_token
 from app.schemas.user import AdminUser
 from app.schemas.worker import WorkerCreate, WorkerRegistrationResponse, Worker
+from app.services.verify_cache import worker_token_cache
 
 router = APIRouter(prefix="/admin", tags=["admin-workers"])
 
+# Set of registered worker IDs, so listing doesn't SCAN the keyspace.
+# Deliberately outside the "worker:*" pattern, which only holds worker hashes.
+WORKER_IDS_KEY = "workers:ids"
+
+# Built once: validates/serializes the whole list in one pydantic-core call
+_worker_list_adapter = TypeAdapter(list[Worker])
+
 @router.post("/workers", response_model=WorkerRegistrationResponse, status_code=201)
-async def register_worker(worker_in: WorkerCreate, admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_redis)):
+async def register_worker(worker_in: WorkerCreate, admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_async_redis)):
     worker_id = str(uuid.uuid4())
     worker_token = create_worker_token(worker_id)
     token_hash = hash_token(worker_token)
@@ -21,20 +30,32 @@ async def register_worker(worker_in: WorkerCreate, admin: AdminUser = Depends(ge
         "registered_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "last_active": ""  # Empty string instead of None for Redis
     }
-    r.hset(f"worker:{worker_id}", mapping=worker_data)
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.hset(f"worker:{worker_id}", mapping=worker_data)
+        pipe.sadd(WORKER_IDS_KEY, worker_id)
+        await pipe.execute()
     return WorkerRegistrationResponse(**worker_data, worker_token=worker_token)
 
 @router.get("/workers", response_model=list[Worker])
-async def list_workers(admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_redis)):
-    workers = []
-    for key in r.scan_iter("worker:*"):
-        worker_data = r.hgetall(key)
-        if worker_data:
-            workers.append(Worker(**worker_data))
-    return workers
+async def list_workers(admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_async_redis)):
+    worker_ids = list(await r.smembers(WORKER_IDS_KEY))
+    async with r.pipeline(transaction=False) as pipe:
+        for worker_id in worker_ids:
+            pipe.hgetall(f"worker:{worker_id}")
+        results = await pipe.execute()
+    # Drop index entries whose hash was deleted out-of-band
+    missing = [worker_id for worker_id, worker_data in zip(worker_ids, results) if not worker_data]
+    if missing:
+        await r.srem(WORKER_IDS_KEY, *missing)
+    workers = _worker_list_adapter.validate_python([worker_data for worker_data in results if worker_data])
+    return Response(content=_worker_list_adapter.dump_json(workers), media_type="application/json")
 
 @router.delete("/workers/{worker_id}", status_code=204)
-async def revoke_worker(worker_id: str, admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_redis)):
-    deleted_count = r.delete(f"worker:{worker_id}")
+async def revoke_worker(worker_id: str, admin: AdminUser = Depends(get_current_admin), r: Redis = Depends(get_async_redis)):
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.delete(f"worker:{worker_id}")
+        pipe.srem(WORKER_IDS_KEY, worker_id)
+        deleted_count, _ = await pipe.execute()
+    worker_token_cache.evict_where(lambda worker_info: worker_info[0] == worker_id)
     if deleted_count == 0:
         raise HTTPException(status_code=404, detail="Worker not found")
\ No newline at end of file
@@ -1,25 +1,25 @@
 # app/api/v1/client_phone.py (mới)
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from app.core.postgres_client import get_db
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.postgres_client import get_async_db
+from app.core.redis_client import get_async_redis
 from app.schemas.phone import PhoneReportCreate, PhoneReportResponse
-from app.services.phone_service import create_report
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from app.services.phone_service import create_report, phone_lookup_key
 from app.core.config import get_settings
-from app.core.rate_limit import get_client_identifier
+from app.core.rate_limit import client_rate_limit
+from app.core.dependencies import json_body
 
 
 settings = get_settings()
-limiter = Limiter(key_func=get_client_identifier) # Per-IP rate limiting
 
 router = APIRouter(prefix="/client", tags=["phone-report"])
 
-@router.post("/phones/report", response_model=PhoneReportResponse, status_code=201)
-@limiter.limit(settings.API_RATE_LIMIT, key_func=get_client_identifier)
-async def report_phone(request: Request, report: PhoneReportCreate, db: Session = Depends(get_db)):
+@router.post("/phones/report", response_model=PhoneReportResponse, status_code=201, dependencies=[Depends(client_rate_limit)])  # Per-IP rate limiting
+async def report_phone(request: Request, report: PhoneReportCreate = Depends(json_body(PhoneReportCreate)), db: AsyncSession = Depends(get_async_db), r: Redis = Depends(get_async_redis)):
     """
     Người dùng report số điện thoại thủ công
     """
-    new_report = create_report(db, report.phone_number, report.report_type, report.reported_by_email)
+    new_report = await create_report(db, report.phone_number, report.report_type, report.reported_by_email)
+    await r.delete(phone_lookup_key(report.phone_number))  # Count/existence changed
     return new_report
\ No newline at end of file
@@ -1,21 +1,26 @@
 # app/api/v1/client_tasks.py
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, EmailStr
-from redis import Redis
+from redis.asyncio import Redis
 import uuid
-import json
+import orjson
 import datetime
 from typing import Optional
-from app.core.redis_client import get_redis
+from app.core.redis_client import get_async_redis
 from app.schemas.task import Task
-from app.services.queue_service import enqueue_task
+from app.services.queue_service import enqueue_task_async, task_eta_script, TASK_ETA_KEYS
+from app.services.captcha_service import verify_turnstile
 from app.core.config import get_settings
-from slowapi import Limiter
-from app.core.rate_limit import get_client_identifier
+from app.core.rate_limit import client_rate_limit
+from app.core.dependencies import json_body
 
 settings = get_settings()
 AVG_WAIT_TIME = settings.AVG_WAIT_TIME_SECONDS or 30  # seconds per task
-limiter = Limiter(key_func=get_client_identifier)  # Per-IP rate limiting.
+# Hash fields read by get_task_status, in unpacking order
+TASK_STATUS_FIELDS = (
+    "status", "payload", "result", "traceback", "retries", "worker_id",
+    "created_at", "started_at", "completed_at", "email_notify",
+)
 
 class TaskCreatePayload(BaseModel):
     voice_url: str
@@ -29,9 +34,8 @@ class TaskWithCaptcha(BaseModel):
 
 router = APIRouter(prefix="/client", tags=["tasks"])
 
-@router.get("/tasks/{task_id}", response_model=Task)
-@limiter.limit(settings.API_RATE_LIMIT, key_func=get_client_identifier)
-async def get_task_status(task_id: str, request: Request, r: Redis = Depends(get_redis)):
+@router.get("/tasks/{task_id}", response_model=Task, dependencies=[Depends(client_rate_limit)])  # Per-IP rate limiting
+async def get_task_status(task_id: str, request: Request, r: Redis = Depends(get_async_redis)):
     """
     Get task status and result
 
@@ -40,8 +44,16 @@ async def get_task_status(task_id: str, request: Request, r: Redis = Depends(get
     """
     from fastapi import HTTPException, status
 
-    task_data = r.hgetall(f"task:{task_id}")
-    if not task_data:
+    # Task fields and queue snapshot in one round trip
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hmget(f"task:{task_id}", TASK_STATUS_FIELDS)
+        await task_eta_script(keys=TASK_ETA_KEYS, args=[task_id], client=pipe)
+        fields, (pending_rank, _pending, processing) = await pipe.execute()
+    (
+        status_, payload_, result_, traceback_, retries_, worker_id_,
+        created_at_, started_at_, completed_at_, email_notify_,
+    ) = fields
+    if status_ is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
@@ -49,37 +61,33 @@ async def get_task_status(task_id: str, request: Request, r: Redis = Depends(get
 
     # Parse the task data
     try:
-        parsed_data = {
-            "task_id": uuid.UUID(task_id),
-            "status": task_data.get("status", "PENDING"),
-            "payload": json.loads(task_data.get("payload", "{}")),
-            "result": json.loads(task_data.get("result", "{}")) if task_data.get("result") else None,
-            "traceback": task_data.get("traceback", ""),
-            "retries": int(task_data.get("retries", 0)),
-            "worker_id": task_data.get("worker_id", ""),
-            "created_at": datetime.datetime.fromisoformat(task_data["created_at"]),
-            "started_at": datetime.datetime.fromisoformat(task_data["started_at"]) if task_data.get("started_at") else None,
-            "completed_at": datetime.datetime.fromisoformat(task_data["completed_at"]) if task_data.get("completed_at") else None,
-            "email_notify": task_data.get("email_notify") if task_data.get("email_notify") != "none" else None,
-        }
-
-        # Calculate queue position if still pending
-        if parsed_data["status"] == "PENDING":
-            pending_tasks = r.lrange("queue:pending", 0, -1)
-            if task_id in pending_tasks:
-                queue_position = pending_tasks.index(task_id) + 1
-                parsed_data["eta"] = queue_position * AVG_WAIT_TIME
-
-        return Task(**parsed_data)
+        eta = None
+        if status_ == "PENDING" and pending_rank >= 0:
+            # Same position formula as submit_task: tasks being processed + tasks ahead + 1
+            eta = (processing + pending_rank + 1) * AVG_WAIT_TIME
+
+        return Task(
+            task_id=uuid.UUID(task_id),
+            status=status_,
+            payload=orjson.loads(payload_) if payload_ else {},
+            result=orjson.loads(result_) if result_ else None,
+            traceback=traceback_ if status_ == "FAILURE" else None,
+            retries=int(retries_ or 0),
+            worker_id=worker_id_ or None,
+            eta=eta,
+            created_at=datetime.datetime.fromisoformat(created_at_),
+            started_at=datetime.datetime.fromisoformat(started_at_) if started_at_ else None,
+            completed_at=datetime.datetime.fromisoformat(completed_at_) if completed_at_ else None,
+            email_notify=email_notify_ if email_notify_ and email_notify_ != "none" else None,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse task data: {str(e)}"
         )
 
-@router.post("/tasks", response_model=Task, status_code=201) # Assuming TaskSubmitResponse is meant to be Task, or needs to be imported/defined. Keeping Task for now.
-@limiter.limit(settings.API_RATE_LIMIT, key_func=get_client_identifier)
-async def submit_task(request: Request, task: TaskWithCaptcha, r: Redis = Depends(get_redis)):
+@router.post("/tasks", response_model=Task, status_code=201, dependencies=[Depends(client_rate_limit)]) # Assuming TaskSubmitResponse is meant to be Task, or needs to be imported/defined. Keeping Task for now.
+async def submit_task(request: Request, task: TaskWithCaptcha = Depends(json_body(TaskWithCaptcha))):
     """
     Submit a new task
 
@@ -94,29 +102,24 @@ async def submit_task(request: Request, task: TaskWithCaptcha, r: Redis = Depend
 
         # 2. Generate task_id
         task_id = str(uuid.uuid4())
+        payload = task.payload.model_dump()
 
-        # 3. Calculate queue position & estimated time
-        pending = r.llen("queue:pending")
-        processing = r.zcard("queue:processing")
-        queue_position = pending + processing + 1
-        estimated_time_seconds = queue_position * AVG_WAIT_TIME
-
-        # 4. Enqueue task
-        enqueue_task(
+        # 3. Enqueue task; queue position comes back from the same round trip
+        task_data = await enqueue_task_async(
             task_id=task_id,
-            payload=task.payload.dict(),
+            payload=payload,
             email_notify=task.email_notify
         )
 
-        # 5. Prepare response
-        task_data = r.hgetall(f"task:{task_id}")
-        task_data["payload"] = json.loads(task_data["payload"])
-        task_data["task_id"] = uuid.UUID(task_id)
-        task_data["created_at"] = datetime.datetime.fromisoformat(task_data["created_at"])
-        task_data["queue_position"] = queue_position
-        task_data["estimated_time_seconds"] = estimated_time_seconds
-
-        return Task(**task_data)
+        # 4. Prepare response from the fields we just stored
+        return Task(
+            task_id=uuid.UUID(task_id),
+            status=task_data["status"],
+            payload=payload,
+            eta=task_data["queue_position"] * AVG_WAIT_TIME,
+            created_at=datetime.datetime.fromisoformat(task_data["created_at"]),
+            email_notify=task.email_notify,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -1,15 +1,17 @@
 # app/api/v1/client_uploads.py
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
-from app.services.storage_service import generate_presigned_upload_url
+from app.services.storage_service import (
+    MULTIPART_THRESHOLD_BYTES,
+    generate_presigned_multipart_upload,
+    generate_presigned_upload_url,
+    run_storage_op,
+)
 from app.services.captcha_service import verify_turnstile
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from app.core.config import get_settings
-from app.core.rate_limit import get_client_identifier
+from app.core.rate_limit import client_rate_limit
 
 settings = get_settings()
-limiter = Limiter(key_func=get_client_identifier)  # Per-IP rate limiting
 
 class UploadRequest(BaseModel):
     filename: str = Field(..., description="Name of the file to upload")
@@ -19,8 +21,7 @@ class UploadRequest(BaseModel):
 
 router = APIRouter(prefix="/client", tags=["uploads"])
 
-@router.post("/uploads/presigned-url")
-@limiter.limit(settings.API_RATE_LIMIT, key_func=get_client_identifier)
+@router.post("/uploads/presigned-url", dependencies=[Depends(client_rate_limit)])  # Per-IP rate limiting
 async def get_upload_url(request: Request, req: UploadRequest):
     """
     Generate presigned upload URL
@@ -45,4 +46,36 @@ async def get_upload_url(request: Request, req: UploadRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate upload URL: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/uploads/multipart", dependencies=[Depends(client_rate_limit)])  # Per-IP rate limiting
+async def get_multipart_upload_urls(request: Request, req: UploadRequest):
+    """
+    Start a multipart upload
+
+    For files over MULTIPART_THRESHOLD_BYTES (16 MB). Returns presigned URLs for
+    each part (PUT them concurrently, keeping each response's ETag) plus URLs to
+    complete (POST the part list) or abort (DELETE) the upload.
+    Requires Cloudflare Turnstile verification to prevent abuse.
+    """
+    if req.content_length <= MULTIPART_THRESHOLD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is small enough for a single upload; use /uploads/presigned-url"
+        )
+    try:
+        await verify_turnstile(req.turnstile_token)
+        # CreateMultipartUpload is a network call
+        return await run_storage_op(
+            generate_presigned_multipart_upload,
+            req.filename,
+            req.content_type,
+            req.content_length
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start multipart upload: {str(e)}"
+        )
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, File, UploadFile, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select
 from datetime import datetime, timezone
 from typing import List,Optional
-import uuid, os
+import hashlib, uuid, os
 from app.core.postgres_client import get_db
 from app.models.report import Report, ProofType, Status, Category
 from app.schemas.report import ReportRead
@@ -13,6 +14,7 @@ UPLOAD_DIR = "uploads"
 
 # Ensure the upload directory exists
 MAX_FILE_SIZE = 20 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 64 * 1024
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
@@ -21,6 +23,13 @@ ALLOWED_AUDIO_TYPES = {"audio/mpeg", "audio/wav", "audio/x-wav", "audio/mp3"}
 ALLOWED_EXTS = {"jpg", "jpeg", "png", "webp", "mp4", "mov", "mp3", "wav"}
 
 
+def _file_too_large(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large: {size/1024/1024:.2f} MB. Max allowed: {MAX_FILE_SIZE/1024/1024} MB."
+    )
+
+
 def validate_uploaded_file(upload: UploadFile):
     if not upload or not upload.filename:
         return
@@ -40,13 +49,40 @@ def validate_uploaded_file(upload: UploadFile):
             status_code=400,
             detail=f"Unsupported file type: {mime}"
         )
-    file_bytes = upload.file.read()
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large: {len(file_bytes)/1024/1024:.2f} MB. Max allowed: {MAX_FILE_SIZE/1024/1024} MB."
-        )
-    upload.file.seek(0)
+    # Size known from the multipart parser: reject without touching the body.
+    # save_uploaded_file enforces the limit again while streaming.
+    if upload.size is not None and upload.size > MAX_FILE_SIZE:
+        raise _file_too_large(upload.size)
+
+
+def save_uploaded_file(upload: UploadFile, ext: str) -> str:
+    """
+    Stream an upload to disk in fixed-size chunks, enforcing MAX_FILE_SIZE.
+    The file is named by its SHA-256 (hashed while writing), so identical
+    uploads share one stored file. Returns the stored path.
+    """
+    tmp_path = os.path.join(UPLOAD_DIR, f"{uuid.uuid4()}.part")
+    h = hashlib.sha256()
+    total = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            while chunk := upload.file.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > MAX_FILE_SIZE:
+                    raise _file_too_large(total)
+                h.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    file_path = os.path.join(UPLOAD_DIR, f"{h.hexdigest()[:32]}.{ext}")
+    if os.path.exists(file_path):
+        os.remove(tmp_path)  # Same content already stored
+    else:
+        os.replace(tmp_path, file_path)
+    return file_path
 
 
 # ----- Create report -----
@@ -66,11 +102,7 @@ def create_report(
     if proof_file is not None and proof_file.filename:
         validate_uploaded_file(proof_file)
         ext = proof_file.filename.split(".")[-1].lower()
-        file_name = f"{uuid.uuid4()}.{ext}"
-        file_path = os.path.join(UPLOAD_DIR, file_name)
-        with open(file_path, "wb") as f:
-            f.write(proof_file.file.read())
-        proof_file.file.seek(0)
+        file_path = save_uploaded_file(proof_file, ext)
 
         content_type = proof_file.content_type.split('/')[0]
         if content_type == "image":
@@ -92,11 +124,15 @@ def create_report(
 
     db.add(report)
     db.commit()
-    db.refresh(report)
     return report
 
 #GET reports
+# Columns backing ReportRead, so list rows can be serialized without re-validation
+REPORT_READ_COLUMNS = [Report.__table__.c[name] for name in ReportRead.model_fields]
+
 @router.get("/published",response_model=List[ReportRead])
 def get_reports(db: Session=Depends(get_db)):
-    reports=db.query(Report).filter(Report.status=="Publish").all()
-    return reports
+    # Trusted DB rows: returning a Response skips per-row ReportRead validation
+    # (response_model still documents the shape)
+    reports=db.execute(select(*REPORT_READ_COLUMNS).where(Report.status=="Publish")).mappings()
+    return ORJSONResponse([dict(row) for row in reports])
@@ -2,20 +2,22 @@
 Worker API endpoints - For standalone workers to communicate with server.
 Workers poll for tasks, update status, and submit results via HTTP API.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Header
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
-import datetime
-from datetime import timezone
-import json
+import time
+import orjson
 
-from app.core.redis_client import get_redis
-from app.services.queue_service import get_queue_service
+from app.core.redis_client import async_redis_client
+from app.services.queue_service import claim_next_task_async, complete_task_async, fail_task_async
+from app.services.auth_service import get_auth_service
+from app.services.redis_batch_writer import get_batch_writer
 from app.core.config import get_settings
-from jose import JWTError, jwt
 
 router = APIRouter(prefix="/worker", tags=["worker"])
 settings = get_settings()
+# Hot-path values bound once (read on every request)
+TASK_POLL_TIMEOUT_SECONDS = settings.TASK_POLL_TIMEOUT_SECONDS
 
 
 # ============================================================================
@@ -30,26 +32,37 @@ class TaskResponse(BaseModel):
     eta: int
 
 
-class StatusUpdateRequest(BaseModel):
-    """Request to update task status."""
-    status: str
-
-
-class CompleteTaskRequest(BaseModel):
-    """Request to mark task as completed."""
-    result: Dict[str, Any]
-
-
-class FailTaskRequest(BaseModel):
-    """Request to mark task as failed."""
-    error: str
+def body_field(name: str, kind: type):
+    """
+    Dependency reading one typed field from a JSON body.
+    Worker bodies are tiny and trusted, so this parses with orjson and checks the
+    one field directly instead of building a pydantic model per request.
+    
+    Args:
+        name: Field to extract
+        kind: Required Python type of the field
+    """
+    async def dependency(request: Request):
+        try:
+            body = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid JSON body")
+        
+        value = body.get(name) if isinstance(body, dict) else None
+        if not isinstance(value, kind):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Field '{name}' must be of type {kind.__name__}"
+            )
+        return value
+    return dependency
 
 
 # ============================================================================
 # AUTHENTICATION HELPER
 # ============================================================================
 
-def verify_worker_token(authorization: str = Header(...)) -> tuple[str, str]:
+async def verify_worker_token(authorization: str = Header(...)) -> tuple[str, str]:
     """
     Verify worker JWT token and return worker info.
     
@@ -64,40 +77,7 @@ def verify_worker_token(authorization: str = Header(...)) -> tuple[str, str]:
         )
     
     token = authorization.replace("Bearer ", "")
-    
-    try:
-        payload = jwt.decode(
-            token,
-            settings.WORKER_JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-            options={"verify_exp": False}  # Worker tokens don't expire
-        )
-        worker_id: str = payload.get("sub")
-        
-        if not worker_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-        
-        # Get worker info from Redis
-        r = get_redis()
-        worker_data = r.hgetall(f"worker:{worker_id}")
-        
-        if not worker_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Worker not found"
-            )
-        
-        return worker_id, worker_data.get("name", "Unknown")
-        
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return await get_auth_service().verify_worker_token(token)
 
 
 # ============================================================================
@@ -107,31 +87,22 @@ def verify_worker_token(authorization: str = Header(...)) -> tuple[str, str]:
 @router.get("/tasks/next")
 async def get_next_task(worker_info: tuple = Depends(verify_worker_token)):
     """
-    Poll for next available task.
-    Returns 204 No Content if no tasks available.
+    Long-poll for the next available task.
+    Blocks up to TASK_POLL_TIMEOUT_SECONDS; returns 204 No Content if none arrived.
     """
     worker_id, worker_name = worker_info
-    queue_service = get_queue_service()
     
-    task_id = queue_service.get_next_pending_task()
+    task_data = await claim_next_task_async(worker_id, TASK_POLL_TIMEOUT_SECONDS)
     
-    if not task_id:
+    if not task_data:
         # No tasks available
         raise HTTPException(status_code=status.HTTP_204_NO_CONTENT)
     
-    # Get task data
-    task_data = queue_service.get_task_data(task_id)
-    if not task_data:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-    
-    # Mark as started
-    queue_service.start_processing(task_id, worker_id)
-    
     # Parse payload
-    payload = json.loads(task_data.get("payload", "{}"))
+    payload = orjson.loads(task_data.get("payload", "{}"))
     
     return {
-        "task_id": task_id,
+        "task_id": task_data["task_id"],
         "payload": payload,
         "created_at": task_data.get("created_at", ""),
         "eta": int(task_data.get("eta", 30))
@@ -141,40 +112,35 @@ async def get_next_task(worker_info: tuple = Depends(verify_worker_token)):
 @router.patch("/tasks/{task_id}/status")
 async def update_task_status(
     task_id: str,
-    request: StatusUpdateRequest,
+    new_status: str = Depends(body_field("status", str)),
     worker_info: tuple = Depends(verify_worker_token)
 ):
     """Update task status."""
     worker_id, worker_name = worker_info
-    queue_service = get_queue_service()
     
-    task_data = queue_service.get_task_data(task_id)
-    if not task_data:
+    if not await async_redis_client.exists(f"task:{task_id}"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
-    # Update status in Redis
-    r = get_redis()
-    r.hset(f"task:{task_id}", "status", request.status)
+    # Update status in Redis (batched, fire-and-forget)
+    get_batch_writer().hset(f"task:{task_id}", "status", new_status)
     
-    return {"message": "Status updated", "task_id": task_id, "status": request.status}
+    return {"message": "Status updated", "task_id": task_id, "status": new_status}
 
 
 @router.post("/tasks/{task_id}/complete")
 async def complete_task(
     task_id: str,
-    request: CompleteTaskRequest,
+    result: dict = Depends(body_field("result", dict)),
     worker_info: tuple = Depends(verify_worker_token)
 ):
     """Mark task as completed with result."""
     worker_id, worker_name = worker_info
-    queue_service = get_queue_service()
     
-    task_data = queue_service.get_task_data(task_id)
-    if not task_data:
+    if not await async_redis_client.exists(f"task:{task_id}"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
     # Complete task
-    queue_service.complete_task(task_id, request.result)
+    await complete_task_async(task_id, result)
     
     return {"message": "Task completed", "task_id": task_id}
 
@@ -182,20 +148,16 @@ async def complete_task(
 @router.post("/tasks/{task_id}/fail")
 async def fail_task(
     task_id: str,
-    request: FailTaskRequest,
+    error: str = Depends(body_field("error", str)),
     worker_info: tuple = Depends(verify_worker_token)
 ):
     """Mark task as failed with error message."""
     worker_id, worker_name = worker_info
-    queue_service = get_queue_service()
     
-    task_data = queue_service.get_task_data(task_id)
-    if not task_data:
+    # One script call: existence check, processing -> failed, retries += 1
+    if await fail_task_async(task_id, error) is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
-    # Fail task
-    queue_service.fail_task(task_id, request.error)
-    
     return {"message": "Task marked as failed", "task_id": task_id}
 
 
@@ -207,11 +169,8 @@ async def worker_heartbeat(worker_info: tuple = Depends(verify_worker_token)):
     """
     worker_id, worker_name = worker_info
     
-    r = get_redis()
-    r.hset(
-        f"worker:{worker_id}",
-        "last_active",
-        datetime.datetime.now(timezone.utc).isoformat()
-    )
+    # Batched, fire-and-forget: heartbeats are frequent and loss-tolerant.
+    # Stored as epoch seconds; the Worker schema converts to datetime on read.
+    get_batch_writer().hset(f"worker:{worker_id}", "last_active", int(time.time()))
     
     return {"message": "Heartbeat received", "worker_id": worker_id}
@@ -1,7 +1,7 @@
 # app/core/config.py
 from pydantic_settings import BaseSettings
 from pydantic import model_validator
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Optional
 
 class Settings(BaseSettings):
@@ -11,12 +11,18 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str
-    REDIS_RETRY_MAX_ATTEMPTS: int = 5
-    REDIS_RETRY_BASE_DELAY: float = 1.0  # seconds
-    REDIS_RETRY_MAX_DELAY: float = 60.0  # seconds
+    # Per-command retry on transient faults; keep the total sleep sub-second (0.1 + 0.2 + 0.4s worst case)
+    REDIS_RETRY_MAX_ATTEMPTS: int = 3
+    REDIS_RETRY_BASE_DELAY: float = 0.05  # seconds
+    REDIS_RETRY_MAX_DELAY: float = 1.0  # seconds
     REDIS_SOCKET_KEEPALIVE: bool = True
     REDIS_SOCKET_TIMEOUT: int = 5  # seconds
-    REDIS_MAX_CONNECTIONS: int = 50  # connection pool size
+    # Pool size per process. Unset: EXPECTED_CONCURRENCY * REDIS_POOL_RATIO / UVICORN_WORKERS (min 10)
+    REDIS_MAX_CONNECTIONS: Optional[int] = None
+    REDIS_POOL_RATIO: float = 0.4  # share of in-flight requests holding a Redis connection at once
+    EXPECTED_CONCURRENCY: int = 512  # concurrent requests across all uvicorn workers
+    UVICORN_WORKERS: int = 1
+    REDIS_POOL_TIMEOUT: int = 5  # seconds to wait for a free pooled connection
 
     # Postgres
     POSTGRES_HOST: str = "postgres"
@@ -25,23 +31,48 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str = "blacklist"
     POSTGRES_URL: Optional[str] = None
+    POSTGRES_ASYNC_URL: Optional[str] = None  # asyncpg URL, derived from POSTGRES_URL if unset
+    POSTGRES_POOL_SIZE: int = 20
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30  # seconds
+    POSTGRES_QUERY_CACHE_SIZE: int = 1200  # compiled-statement cache entries per engine
+    POSTGRES_STATEMENT_TIMEOUT_MS: int = 30000  # per-statement server-side limit (0 = off)
+    POSTGRES_IDLE_IN_TX_TIMEOUT_MS: int = 60000  # kill sessions idling inside a transaction (0 = off)
+
+    @model_validator(mode='after')
+    def size_redis_pool(self) -> 'Settings':
+        if self.REDIS_MAX_CONNECTIONS is None:
+            per_worker = self.EXPECTED_CONCURRENCY * self.REDIS_POOL_RATIO / max(self.UVICORN_WORKERS, 1)
+            self.REDIS_MAX_CONNECTIONS = max(10, int(per_worker))
+        return self
 
     @model_validator(mode='after')
     def assemble_db_connection(self) -> 'Settings':
         if not self.POSTGRES_URL:
             self.POSTGRES_URL = f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        if not self.POSTGRES_ASYNC_URL:
+            _, _, rest = self.POSTGRES_URL.partition("://")
+            self.POSTGRES_ASYNC_URL = f"postgresql+asyncpg://{rest}"
         return self
 
     # JWT
     ADMIN_JWT_SECRET_KEY: str
     WORKER_JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
+    ADMIN_BLOCKLIST_REFRESH_SECONDS: float = 5.0  # how stale the in-process logout blocklist may get
+    # argon2id password hashing cost (memory in KiB)
+    PASSWORD_HASH_TIME_COST: int = 2
+    PASSWORD_HASH_MEMORY_COST: int = 65536
+    PASSWORD_HASH_PARALLELISM: int = 1
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # concurrent hashes per process; defaults to CPU count
 
     # Task config
     AVG_WAIT_TIME_SECONDS: int = 5
     MAX_RETRIES: int = 0
     MAX_TASK_RETRIES: int = 1  # Maximum number of times a task can be retried by janitor
     TASK_TIMEOUT_SECONDS: int = 30
+    TASK_POLL_TIMEOUT_SECONDS: int = 25  # how long /worker/tasks/next blocks waiting for a task
+    COMPLETED_TASK_TTL_SECONDS: int = 7 * 24 * 3600  # how long a finished task's hash (and result) is kept
 
     # Email (Resend or SMTP – tùy chọn)
     RESEND_API_KEY: Optional[str] = None
@@ -57,6 +88,7 @@ class Settings(BaseSettings):
     S3_SECRET_ACCESS_KEY: str
     S3_BUCKET_NAME: str
     S3_REGION: str = "auto"  # R2 dùng "auto"
+    S3_ADDRESSING_STYLE: str = "virtual"  # "path" for MinIO-style endpoints without bucket subdomains
     S3_PRESIGNED_EXPIRE: int = 300
     S3_MAX_UPLOAD_MB: int = 25
 
@@ -84,25 +116,25 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins from comma-separated string"""
         if self.CORS_ORIGINS == "*":
             return ["*"]
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
 
-    @property
+    @cached_property
     def cors_methods_list(self) -> list[str]:
         """Parse CORS methods from comma-separated string"""
         return [method.strip() for method in self.CORS_ALLOW_METHODS.split(",") if method.strip()]
 
-    @property
+    @cached_property
     def allowed_hosts_list(self) -> list[str]:
         """Parse allowed hosts from comma-separated string"""
         if self.ALLOWED_HOSTS == "*":
             return ["*"]
         return [host.strip() for host in self.ALLOWED_HOSTS.split(",") if host.strip()]
 
-@lru_cache
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     return Settings()
\ No newline at end of file
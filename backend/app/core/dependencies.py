@@ -3,8 +3,10 @@
 Dependency injection providers for all services.
 Centralizes service instantiation for easy testing and maintainability.
 """
-from typing import Generator
-from fastapi import Depends
+from typing import Callable, Generator, Type, TypeVar
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 
 from app.services.redis_service import RedisService, get_redis_service
@@ -57,6 +59,37 @@ def provide_db_session() -> Generator[Session, None, None]:
     yield from postgres_service.get_session()
 
 
+# ============================================================================
+# REQUEST BODIES
+# ============================================================================
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def json_body(model: Type[ModelT]) -> Callable:
+    """
+    Provide a JSON request body validated straight from raw bytes.
+    
+    `model_validate_json` parses in pydantic-core, skipping FastAPI's stdlib
+    json.loads + second pass over the resulting dict. Errors keep FastAPI's
+    422 shape (locations prefixed with "body").
+    
+    Args:
+        model: Pydantic model describing the body
+        
+    Returns:
+        Callable: Dependency returning the validated model
+    """
+    async def dependency(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+            )
+    return dependency
+
+
 # ============================================================================
 # BUSINESS LOGIC SERVICES (imported after service files are refactored)
 # ============================================================================
@@ -1,12 +1,43 @@
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.POSTGRES_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session GUCs applied when each pooled connection is opened (no per-checkout round trip)
+SESSION_SETTINGS = {
+    "statement_timeout": str(settings.POSTGRES_STATEMENT_TIMEOUT_MS),
+    "idle_in_transaction_session_timeout": str(settings.POSTGRES_IDLE_IN_TX_TIMEOUT_MS),
+}
+
+# Sync engine - used by sync routes (donate, report) and scripts
+engine = create_engine(
+    settings.POSTGRES_URL,
+    query_cache_size=settings.POSTGRES_QUERY_CACHE_SIZE,
+    # psycopg2: batch executemany UPDATE/DELETE too, not just INSERT
+    executemany_mode="values_plus_batch",
+    connect_args={"options": " ".join(f"-c {k}={v}" for k, v in SESSION_SETTINGS.items())},
+)
+# expire_on_commit=False: committed objects keep their (RETURNING-populated) state,
+# so callers don't need a refresh() SELECT after each write
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine - used by async routes so queries yield to the event loop
+async_engine = create_async_engine(
+    settings.POSTGRES_ASYNC_URL,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    query_cache_size=settings.POSTGRES_QUERY_CACHE_SIZE,
+    # asyncpg already prepares statements server-side and caches them per connection
+    connect_args={"server_settings": SESSION_SETTINGS},
+    echo=False,
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -15,4 +46,8 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,14 +1,132 @@
 # app/core/rate_limit.py
 """
 Rate limiting configuration and key functions.
-Provides custom key functions for different rate limiting strategies.
+Provides custom key functions for different rate limiting strategies and a
+Redis-backed token bucket shared by all app processes.
 """
-from fastapi import Request
-from slowapi.util import get_remote_address
-from jose import jwt, JWTError
+import math
+import time
+from typing import Callable, Tuple
+from fastapi import HTTPException, Request, status
 from .config import get_settings
+from .redis_client import async_redis_client
+from app.services.verify_cache import VerifyCache, get_verified_claims
 
 settings = get_settings()
+# Hot-path values bound once (read on every request)
+ADMIN_JWT_SECRET_KEY = settings.ADMIN_JWT_SECRET_KEY
+WORKER_JWT_SECRET_KEY = settings.WORKER_JWT_SECRET_KEY
+JWT_ALGORITHMS = [settings.JWT_ALGORITHM]
+TRUST_PROXY_HEADERS = settings.TRUST_PROXY_HEADERS
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+# KEYS: bucket hash
+# ARGV: capacity, refill rate (tokens/second), now in ms
+# Refills by elapsed time, takes one token if available; returns 1 if allowed, else 0.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'last_ms')
+local tokens = tonumber(bucket[1]) or capacity
+local last = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate / 1000)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'last_ms', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return allowed
+"""
+
+_token_bucket_script = async_redis_client.register_script(TOKEN_BUCKET_LUA)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate_limit(limit: str) -> Tuple[int, float]:
+    """
+    Parse a limit string such as "100/minute" into token bucket parameters.
+    
+    Args:
+        limit: "<count>/<second|minute|hour|day>"
+        
+    Returns:
+        tuple: (capacity, refill rate in tokens per second)
+    """
+    count, _, period = limit.partition("/")
+    capacity = int(count)
+    seconds = _PERIODS[period.strip().lower().rstrip("s")]
+    return capacity, capacity / seconds
+
+
+def token_bucket(limit: str, key_func: Callable[[Request], str]):
+    """
+    Build a FastAPI dependency enforcing `limit` per key and per endpoint.
+    
+    Args:
+        limit: Limit string, e.g. settings.API_RATE_LIMIT
+        key_func: Function mapping a request to its rate limit key
+        
+    Returns:
+        Dependency raising 429 when the bucket is empty
+    """
+    capacity, rate = parse_rate_limit(limit)
+    retry_after = str(math.ceil(1 / rate))
+    
+    async def check_rate_limit(request: Request) -> None:
+        endpoint = request.scope.get("endpoint")
+        name = getattr(endpoint, "__name__", request.url.path)
+        allowed = await _token_bucket_script(
+            keys=[f"ratelimit:{name}:{key_func(request)}"],
+            args=[capacity, rate, int(time.time() * 1000)],
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {limit}",
+                headers={"Retry-After": retry_after},
+            )
+    
+    return check_rate_limit
+
+
+def _token_identifier(request: Request, cache: VerifyCache, secret: str, prefix: str) -> str:
+    """
+    Build "{prefix}{sub}" for a valid bearer token, else "ip:{address}".
+    Built keys are cached per token, so repeat requests skip the decode and the concat.
+    """
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return "ip:" + _get_real_ip(request)
+    
+    token = auth_header[7:]
+    key = cache.get(token)
+    if key is not None:
+        return key
+    
+    # Verified, not get_unverified_claims: an unsigned `sub` would let a client
+    # mint a fresh bucket per request (bypassing the limit) or drain someone
+    # else's. The key cache above already limits the HMAC to once per token.
+    try:
+        payload = get_verified_claims(token, secret, JWT_ALGORITHMS)
+    except Exception:
+        # Fallback to IP if token invalid
+        return "ip:" + _get_real_ip(request)
+    
+    key = prefix + payload.get("sub", "anonymous")
+    cache.set(token, key, expires_at=payload.get("exp"))
+    return key
+
+
+# Token -> rate limit key, one cache per identifier (same token, different keys)
+_admin_key_cache = VerifyCache(maxsize=10_000, ttl=30)
+_worker_key_cache = VerifyCache(maxsize=4096, ttl=30)
 
 
 def get_admin_user_identifier(request: Request) -> str:
@@ -25,22 +143,7 @@ def get_admin_user_identifier(request: Request) -> str:
     Returns:
         str: Rate limit key in format "admin:{username}" or "ip:{address}"
     """
-    try:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return f"ip:{_get_real_ip(request)}"
-        
-        token = auth_header.replace("Bearer ", "")
-        payload = jwt.decode(
-            token, 
-            settings.ADMIN_JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        username = payload.get("sub", "anonymous")
-        return f"admin:{username}"
-    except (JWTError, Exception):
-        # Fallback to IP if token invalid or missing
-        return f"ip:{_get_real_ip(request)}"
+    return _token_identifier(request, _admin_key_cache, ADMIN_JWT_SECRET_KEY, "admin:")
 
 
 def get_worker_identifier(request: Request) -> str:
@@ -57,22 +160,7 @@ def get_worker_identifier(request: Request) -> str:
     Returns:
         str: Rate limit key in format "worker:{worker_id}" or "ip:{address}"
     """
-    try:
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return f"ip:{_get_real_ip(request)}"
-        
-        token = auth_header.replace("Bearer ", "")
-        payload = jwt.decode(
-            token, 
-            settings.WORKER_JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        worker_id = payload.get("sub", "anonymous")
-        return f"worker:{worker_id}"
-    except (JWTError, Exception):
-        # Fallback to IP if token invalid or missing
-        return f"ip:{_get_real_ip(request)}"
+    return _token_identifier(request, _worker_key_cache, WORKER_JWT_SECRET_KEY, "worker:")
 
 
 def get_client_identifier(request: Request) -> str:
@@ -90,7 +178,7 @@ def get_client_identifier(request: Request) -> str:
     Returns:
         str: Rate limit key in format "ip:{address}"
     """
-    return f"ip:{_get_real_ip(request)}"
+    return "ip:" + _get_real_ip(request)
 
 
 def _get_real_ip(request: Request) -> str:
@@ -110,14 +198,19 @@ def _get_real_ip(request: Request) -> str:
         str: Client IP address
     """
     # If we trust proxy headers, try to get real IP from X-Forwarded-For
-    if settings.TRUST_PROXY_HEADERS:
+    if TRUST_PROXY_HEADERS:
         forwarded_for = request.headers.get("X-Forwarded-For", "")
         if forwarded_for:
             # X-Forwarded-For: client, proxy1, proxy2
             # First IP is the real client
-            real_ip = forwarded_for.split(",")[0].strip()
+            real_ip = forwarded_for.partition(",")[0].strip()
             if real_ip:
                 return real_ip
     
     # Fallback to remote address (direct connection or proxy IP)
-    return get_remote_address(request)
+    return request.client.host if request.client else "127.0.0.1"
+
+
+# Shared dependencies for route `dependencies=[Depends(...)]`
+client_rate_limit = token_bucket(settings.API_RATE_LIMIT, get_client_identifier)
+admin_rate_limit = token_bucket(settings.ADMIN_RATE_LIMIT, get_admin_user_identifier)
@@ -1,82 +1,94 @@
 import redis
-from redis import ConnectionPool, Redis
-from redis.exceptions import RedisError, ConnectionError
-import time
+import redis.asyncio
+import redis.asyncio.retry
+from redis import BlockingConnectionPool, Redis
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+from redis.retry import Retry
 import logging
-from functools import wraps
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-def retry_with_backoff(max_attempts: int, base_delay: float, max_delay: float):
-    """
-    Retry decorator with exponential backoff for Redis operations.
-    
-    Args:
-        max_attempts: Maximum number of retry attempts
-        base_delay: Initial delay in seconds (doubles each retry)
-        max_delay: Maximum delay between retries in seconds
-    """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except (RedisError, ConnectionError) as e:
-                    if attempt == max_attempts - 1:
-                        logger.error(f"Redis connection failed after {max_attempts} attempts: {e}")
-                        raise
-                    
-                    # Calculate exponential backoff delay: min(base_delay * 2^attempt, max_delay)
-                    delay = min(base_delay * (2 ** attempt), max_delay)
-                    logger.warning(
-                        f"Redis connection failed (attempt {attempt + 1}/{max_attempts}), "
-                        f"retrying in {delay}s: {e}"
-                    )
-                    time.sleep(delay)
-            return None
-        return wrapper
-    return decorator
+# Transient connection faults are retried per command inside redis-py, with
+# exponential backoff between attempts (non-blocking sleeps on the async client).
+def _retry(retry_cls):
+    return retry_cls(
+        ExponentialBackoff(cap=settings.REDIS_RETRY_MAX_DELAY, base=settings.REDIS_RETRY_BASE_DELAY),
+        retries=settings.REDIS_RETRY_MAX_ATTEMPTS,
+    )
 
 
-# Create connection pool with health checks and retry configuration
-connection_pool = ConnectionPool.from_url(
+# Create connection pool with health checks and retry configuration.
+# Shared process-wide and sized from expected concurrency (see Settings); when
+# exhausted, callers wait up to REDIS_POOL_TIMEOUT for a free connection instead
+# of failing. Idle connections are reused LIFO, keeping the hot ones warm. Replies use the hiredis C parser when installed.
+connection_pool = BlockingConnectionPool.from_url(
     settings.REDIS_URL,
     decode_responses=True,
     max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
     socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
     socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
-    retry_on_timeout=True,
+    retry=_retry(Retry),
+    retry_on_error=[ConnectionError, TimeoutError],
     health_check_interval=30  # Check connection health every 30 seconds
 )
 
 # Initialize Redis client with connection pool
 redis_client = Redis(connection_pool=connection_pool)
 
+# Async client for `async def` routes, so Redis round trips don't block the event loop.
+# Same settings as the sync pool; services, janitor and scripts keep the sync client.
+async_connection_pool = redis.asyncio.BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    retry=_retry(redis.asyncio.retry.Retry),
+    retry_on_error=[ConnectionError, TimeoutError],
+    health_check_interval=30
+)
+async_redis_client = redis.asyncio.Redis(connection_pool=async_connection_pool)
 
-@retry_with_backoff(
-    max_attempts=settings.REDIS_RETRY_MAX_ATTEMPTS,
-    base_delay=settings.REDIS_RETRY_BASE_DELAY,
-    max_delay=settings.REDIS_RETRY_MAX_DELAY
+# Client for blocking commands (worker long-poll BLMOVE). Own unbounded pool so
+# waiting workers can't starve the request pool, and no socket timeout, since a
+# blocked read legitimately stays silent for the whole block time.
+async_blocking_client = redis.asyncio.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+    socket_timeout=None,
+    health_check_interval=30
 )
+
+
 def get_redis() -> Redis:
     """
-    Get Redis client with automatic retry and exponential backoff.
+    Get the shared Redis client.
     
     Returns:
-        Redis: Configured Redis client instance
-        
-    Raises:
-        RedisError: If connection fails after all retry attempts
+        Redis: Pooled client; commands retry transient connection errors
+        with exponential backoff (see `_retry`)
     """
-    # Test connection
-    redis_client.ping()
     return redis_client
 
 
+async def get_async_redis() -> redis.asyncio.Redis:
+    """
+    FastAPI dependency returning the shared async Redis client.
+    
+    Returns:
+        redis.asyncio.Redis: Pooled async client (stale connections are
+        re-checked by health_check_interval, so no per-request ping)
+    """
+    return async_redis_client
+
+
 # For initial connection test at startup
 try:
     redis_client.ping()
@@ -6,11 +6,56 @@ Security utilities and middleware
 from fastapi import HTTPException, Security, status, Header
 from fastapi.security import APIKeyHeader
 from typing import Optional
+import hashlib
 import re
 import secrets
 from app.core.config import get_settings
 
 settings = get_settings()
+# Hot-path values bound once (read on every request)
+# API keys pre-encoded so compare_digest doesn't re-encode the secret per call
+ADMIN_API_KEY = settings.ADMIN_API_KEY.encode() if settings.ADMIN_API_KEY else None
+WORKER_API_KEY = settings.WORKER_API_KEY.encode() if settings.WORKER_API_KEY else None
+TRUST_PROXY_HEADERS = settings.TRUST_PROXY_HEADERS
+
+# Validation patterns, compiled once at import
+_PHONE_RE = re.compile(r'^\+?[1-9]\d{1,14}$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_URL_RE = re.compile(r'^https?://[^\s/$.?#].[^\s]*$')
+
+# Common SQL injection patterns
+_SQL_INJECTION_PATTERNS = [
+    r"(\bOR\b|\bAND\b).*?[=<>]",  # OR/AND with comparison
+    r";\s*(DROP|DELETE|UPDATE|INSERT|CREATE|ALTER)",  # Dangerous commands
+    r"--",  # SQL comments
+    r"/\*.*?\*/",  # SQL block comments
+    r"(UNION|SELECT|FROM|WHERE)\s",  # SQL keywords
+    r"['\";]",  # Quotes and semicolons (basic)
+]
+
+# Common XSS patterns
+_XSS_PATTERNS = [
+    r"<script[^>]*>.*?</script>",  # Script tags
+    r"javascript:",  # JavaScript protocol
+    r"on\w+\s*=",  # Event handlers (onclick, onload, etc.)
+    r"<iframe",  # Iframes
+    r"<object",  # Object tags
+    r"<embed",  # Embed tags
+]
+
+# One case-insensitive alternation per check: a single scan, no upper()/lower() copy
+_SQL_INJECTION_RE = re.compile("|".join(f"(?:{p})" for p in _SQL_INJECTION_PATTERNS), re.IGNORECASE)
+_XSS_RE = re.compile("|".join(f"(?:{p})" for p in _XSS_PATTERNS), re.IGNORECASE)
+# Both sets in one pass for validate_input_security; SQL is listed first so it
+# wins when both match at the same position
+_THREAT_RE = re.compile(
+    f"(?P<sql>{_SQL_INJECTION_RE.pattern})|(?P<xss>{_XSS_RE.pattern})", re.IGNORECASE
+)
+
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'[0-9]')
+_SPECIAL_CHAR_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
 
 # API Key headers
 admin_api_key_header = APIKeyHeader(name="X-Admin-API-Key", auto_error=False)
@@ -23,7 +68,7 @@ def verify_admin_api_key(api_key: Optional[str] = Security(admin_api_key_header)
 
     This provides an additional layer of security beyond JWT tokens.
     """
-    if not settings.ADMIN_API_KEY:
+    if not ADMIN_API_KEY:
         # API key not configured, skip check
         return True
 
@@ -33,7 +78,7 @@ def verify_admin_api_key(api_key: Optional[str] = Security(admin_api_key_header)
             detail="Admin API key required"
         )
 
-    if not secrets.compare_digest(api_key, settings.ADMIN_API_KEY):
+    if not secrets.compare_digest(api_key.encode(), ADMIN_API_KEY):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid admin API key"
@@ -48,7 +93,7 @@ def verify_worker_api_key(api_key: Optional[str] = Security(worker_api_key_heade
 
     This provides an additional layer of security beyond JWT tokens.
     """
-    if not settings.WORKER_API_KEY:
+    if not WORKER_API_KEY:
         # API key not configured, skip check
         return True
 
@@ -58,7 +103,7 @@ def verify_worker_api_key(api_key: Optional[str] = Security(worker_api_key_heade
             detail="Worker API key required"
         )
 
-    if not secrets.compare_digest(api_key, settings.WORKER_API_KEY):
+    if not secrets.compare_digest(api_key.encode(), WORKER_API_KEY):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid worker API key"
@@ -99,16 +144,14 @@ def validate_phone_number(phone: str) -> bool:
 
     Accepts international format: +[country code][number]
     """
-    pattern = r'^\+?[1-9]\d{1,14}$'
-    return bool(re.match(pattern, phone))
+    return bool(_PHONE_RE.match(phone))
 
 
 def validate_email(email: str) -> bool:
     """
     Validate email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def validate_url(url: str, allowed_schemes: list[str] = None) -> bool:
@@ -123,8 +166,7 @@ def validate_url(url: str, allowed_schemes: list[str] = None) -> bool:
         allowed_schemes = ['http', 'https']
 
     # Basic URL pattern
-    pattern = r'^https?://[^\s/$.?#].[^\s]*$'
-    if not re.match(pattern, url):
+    if not _URL_RE.match(url):
         return False
 
     # Check scheme
@@ -138,22 +180,7 @@ def check_sql_injection(text: str) -> bool:
 
     Returns True if potential SQL injection detected
     """
-    # Common SQL injection patterns
-    sql_patterns = [
-        r"(\bOR\b|\bAND\b).*?[=<>]",  # OR/AND with comparison
-        r";\s*(DROP|DELETE|UPDATE|INSERT|CREATE|ALTER)",  # Dangerous commands
-        r"--",  # SQL comments
-        r"/\*.*?\*/",  # SQL block comments
-        r"(UNION|SELECT|FROM|WHERE)\s",  # SQL keywords
-        r"['\";]",  # Quotes and semicolons (basic)
-    ]
-
-    text_upper = text.upper()
-    for pattern in sql_patterns:
-        if re.search(pattern, text_upper, re.IGNORECASE):
-            return True
-
-    return False
+    return _SQL_INJECTION_RE.search(text) is not None
 
 
 def check_xss(text: str) -> bool:
@@ -162,22 +189,7 @@ def check_xss(text: str) -> bool:
 
     Returns True if potential XSS detected
     """
-    # Common XSS patterns
-    xss_patterns = [
-        r"<script[^>]*>.*?</script>",  # Script tags
-        r"javascript:",  # JavaScript protocol
-        r"on\w+\s*=",  # Event handlers (onclick, onload, etc.)
-        r"<iframe",  # Iframes
-        r"<object",  # Object tags
-        r"<embed",  # Embed tags
-    ]
-
-    text_lower = text.lower()
-    for pattern in xss_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True
-
-    return False
+    return _XSS_RE.search(text) is not None
 
 
 def validate_input_security(text: str, field_name: str = "input") -> str:
@@ -186,19 +198,37 @@ def validate_input_security(text: str, field_name: str = "input") -> str:
 
     Raises HTTPException if dangerous patterns detected
     """
-    if check_sql_injection(text):
+    # Single scan for both pattern sets; clean input (the common case) is read once
+    match = _THREAT_RE.search(text)
+    if match is None:
+        return sanitize_input(text)
+
+    # SQL injection takes precedence, even if it occurs after the first XSS hit
+    if match.lastgroup == "sql" or _SQL_INJECTION_RE.search(text, match.start()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Potential SQL injection detected in {field_name}"
         )
 
-    if check_xss(text):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Potential XSS detected in {field_name}"
-        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Potential XSS detected in {field_name}"
+    )
 
-    return sanitize_input(text)
+
+def token_cache_key(token: str) -> bytes:
+    """
+    Digest a token for use as an in-process cache key, so raw tokens are never held as keys
+
+    BLAKE2b at a 16-byte digest is faster than SHA-256 and needs no truncation.
+
+    Args:
+        token: Raw token
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def generate_api_key(prefix: str = "sk") -> str:
@@ -246,11 +276,11 @@ def get_client_ip(
 
     Only use forwarded headers if TRUST_PROXY_HEADERS is True
     """
-    if settings.TRUST_PROXY_HEADERS:
+    if TRUST_PROXY_HEADERS:
         # Trust proxy headers
         if x_forwarded_for:
             # X-Forwarded-For can have multiple IPs, use the first one
-            return x_forwarded_for.split(',')[0].strip()
+            return x_forwarded_for.partition(',')[0].strip()
         if x_real_ip:
             return x_real_ip
 
@@ -269,16 +299,16 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
 
-    if not re.search(r'[A-Z]', password):
+    if not _UPPERCASE_RE.search(password):
         return False, "Password must contain at least one uppercase letter"
 
-    if not re.search(r'[a-z]', password):
+    if not _LOWERCASE_RE.search(password):
         return False, "Password must contain at least one lowercase letter"
 
-    if not re.search(r'[0-9]', password):
+    if not _DIGIT_RE.search(password):
         return False, "Password must contain at least one digit"
 
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not _SPECIAL_CHAR_RE.search(password):
         return False, "Password must contain at least one special character"
 
     return True, "Password is strong"
@@ -1,5 +1,6 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api.v1.admin_auth import router as admin_auth_router
 from app.api.v1.admin_tasks import router as admin_tasks_router
 from app.api.v1.admin_workers import router as admin_workers_router
@@ -10,8 +11,9 @@ from app.api.v1.client_phone import router as client_phone_router  # Nếu có
 from app.api.v1.report_router import router as client_report_router
 from app.api.v1.donate_router import router as client_donate_router
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # ----------------------------
 # CORS Middleware
@@ -27,6 +29,7 @@ app.add_middleware(
     allow_methods=["*"],     # GET, POST, PUT, DELETE, PATCH, OPTIONS
     allow_headers=["*"],     # tất cả headers
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)  # Nén response JSON lớn (list endpoints)
 
 app.include_router(admin_auth_router, prefix="/api/v1")
 app.include_router(admin_tasks_router, prefix="/api/v1/admin")
@@ -16,11 +16,14 @@ class Admin(Base):
     and proper relational data management.
     """
     __tablename__ = "admins"
+    # Fetch server-generated created_at/updated_at via RETURNING on INSERT and UPDATE
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, nullable=False, index=True)
     email = Column(String, unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
+    full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
     
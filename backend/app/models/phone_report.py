@@ -1,27 +1,39 @@
 # app/models/phone_report.py (SQLAlchemy model)
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, Index
 from sqlalchemy.sql import func
 from app.core.postgres_client import Base
 import enum
 
-class ReportType(enum.Enum):
+class ReportType(str, enum.Enum):
     scam = "scam"
     spam = "spam"
     harassment = "harassment"
     other = "other"
 
-class ReportStatus(enum.Enum):
+class ReportStatus(str, enum.Enum):
     pending = "pending"
     approved = "approved"
     rejected = "rejected"
 
 class PhoneReport(Base):
     __tablename__ = "phone_reports"
+    # Admin listing: newest first, optionally filtered by status.
+    # Stored with fillfactor=80 (migration 0007) so repeat-report count bumps stay HOT updates.
+    __table_args__ = (
+        Index("ix_phone_reports_status_created", "status", "created_at", "id"),
+        Index("ix_phone_reports_created", "created_at", "id"),
+        # Substring search on the number (PhoneService.list_reports); needs pg_trgm
+        Index(
+            "ix_phone_reports_phone_trgm", "phone_number",
+            postgresql_using="gin", postgresql_ops={"phone_number": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    phone_number = Column(String(20), index=True, nullable=False)
-    report_type = Column(Enum(ReportType), nullable=False)
-    status = Column(Enum(ReportStatus), default=ReportStatus.pending)
+    phone_number = Column(String(20), index=True, unique=True, nullable=False)  # one row per number
+    # VARCHAR + CHECK rather than a PG enum type (see migration 0006)
+    report_type = Column(Enum(ReportType, name="phone_report_type", native_enum=False, length=20, create_constraint=True), nullable=False)
+    status = Column(Enum(ReportStatus, name="phone_report_status", native_enum=False, length=20, create_constraint=True), default=ReportStatus.pending)
     count = Column(Integer, default=1)
     notes = Column(Text, nullable=True)  # Lý do admin reject
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum,Text,ForeignKey,Float,Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Enum,Text,ForeignKey,Float,Boolean,Index,text
+from sqlalchemy.dialects.postgresql import UUID
 from pydantic import EmailStr
 import enum
 from datetime import datetime, timezone
@@ -27,14 +28,20 @@ class ProofType(enum.Enum):
 class Report(Base):
     __tablename__ = "reports"
     __allow_unmapped__ = True
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Public listing filters on status (see report_router /published)
+    __table_args__ = (
+        Index("ix_reports_status_created", "status", "created_at"),
+    )
+    # Generated by Postgres so inserts carry no Python-side default and can be batched
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     title = Column(String(100), nullable=False, index=True)
     description = Column(Text, nullable=False)
-    category = Column(Enum(Category), nullable=False)
+    # VARCHAR + CHECK rather than PG enum types (see migration 0006)
+    category = Column(Enum(Category, name="report_category", native_enum=False, length=16, create_constraint=True), nullable=False)
     detail = Column(Text, nullable=True)
     proof_file = Column(String, nullable=True)
-    proof_type = Column(Enum(ProofType), nullable=True)
-    status = Column(Enum(Status), nullable=False)
+    proof_type = Column(Enum(ProofType, name="report_proof_type", native_enum=False, length=16, create_constraint=True), nullable=True)
+    status = Column(Enum(Status, name="report_status", native_enum=False, length=16, create_constraint=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,35 +1,34 @@
 # app/schemas/phone.py (Pydantic schemas)
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
-from enum import Enum
+from typing import List, Literal, Optional
+from app.models.phone_report import ReportType, ReportStatus
 
-class ReportType(str, Enum):
-    scam = "scam"
-    spam = "spam"
-    harassment = "harassment"
-    other = "other"
-
-class ReportStatus(str, Enum):
-    pending = "pending"
-    approved = "approved"
-    rejected = "rejected"
+# Literal views of the model enums: pydantic-core checks these with a set lookup
+# and accepts both plain strings and the (str-based) enum members the ORM returns
+ReportTypeValue = Literal[tuple(member.value for member in ReportType)]
+ReportStatusValue = Literal[tuple(member.value for member in ReportStatus)]
 
 class PhoneReportCreate(BaseModel):
     phone_number: str = Field(..., max_length=20, description="Phone number to report")
-    report_type: ReportType = Field(..., description="Type of report")
+    report_type: ReportTypeValue = Field(..., description="Type of report")
     notes: Optional[str] = Field(None, description="Additional notes")
     reported_by_email: Optional[str] = Field(None, description="Reporter's email for notifications")
 
 class PhoneReportUpdate(BaseModel):
-    status: Optional[ReportStatus] = None
+    status: Optional[ReportStatusValue] = None
     notes: Optional[str] = None
 
+class PhoneReportBulkAction(BaseModel):
+    """Report IDs for a bulk approve/reject/delete"""
+    ids: List[int] = Field(..., min_length=1, description="Report IDs")
+    note: Optional[str] = Field(None, description="Rejection note (reject only)")
+
 class PhoneReport(BaseModel):
     id: int
     phone_number: str
-    report_type: ReportType
-    status: ReportStatus
+    report_type: ReportTypeValue
+    status: ReportStatusValue
     count: int
     notes: Optional[str] = None
     created_at: datetime
@@ -37,8 +36,7 @@ class PhoneReport(BaseModel):
     task_id: Optional[str] = None
     reported_by_email: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PhoneReportResponse(PhoneReport):
     """Response model for phone report"""
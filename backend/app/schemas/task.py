@@ -3,7 +3,7 @@
 # Thêm field: traceback (last_error), retries (retry_count), worker_id (hostname), eta (estimated_time_seconds).
 
 # app/schemas/task.py (update giống Celery)
-from pydantic import BaseModel, UUID4, EmailStr
+from pydantic import BaseModel, ConfigDict, UUID4, EmailStr
 from enum import Enum
 import datetime
 
@@ -34,5 +34,4 @@ class Task(TaskBase):
     completed_at: datetime.datetime | None = None
     email_notify: EmailStr | None = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -16,7 +16,11 @@ class Worker(WorkerCreate):
         if v == "" or v is None:
             return None
         if isinstance(v, str):
-            return datetime.datetime.fromisoformat(v)
+            # Heartbeats store epoch seconds; older records hold ISO strings
+            try:
+                return datetime.datetime.fromtimestamp(float(v), datetime.timezone.utc)
+            except ValueError:
+                return datetime.datetime.fromisoformat(v)
         return v
 
 class WorkerRegistrationResponse(Worker):
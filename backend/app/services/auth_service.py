@@ -3,23 +3,68 @@
 Authentication service for admin and worker authentication.
 Handles password hashing, JWT token creation/validation, and token blocklisting.
 """
+import asyncio
 import hashlib
+import hmac
+import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import Any, Callable, Optional, Set, Tuple, Union
 import bcrypt
-from jose import JWTError, jwt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from jwt import InvalidTokenError as JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import get_settings
+from app.core.redis_client import async_redis_client
 from app.services.redis_service import RedisService
+from app.services.verify_cache import admin_token_cache, get_verified_claims, worker_token_cache
 from app.schemas.user import AdminUser
 
 settings = get_settings()
+# Hot-path values bound once (read on every request)
+ADMIN_JWT_SECRET_KEY = settings.ADMIN_JWT_SECRET_KEY
+WORKER_JWT_SECRET_KEY = settings.WORKER_JWT_SECRET_KEY
+JWT_ALGORITHM = settings.JWT_ALGORITHM
+JWT_ALGORITHMS = [JWT_ALGORITHM]
+# Revoked jtis scored by their token's exp, so expired entries can be pruned
+ADMIN_BLOCKLIST_KEY = "auth:admin_blocklist:exp"
+ADMIN_BLOCKLIST_REFRESH_SECONDS = settings.ADMIN_BLOCKLIST_REFRESH_SECONDS
+
+# argon2id for new hashes; bcrypt hashes from before the switch still verify
+# and are upgraded on the next successful login
+password_hasher = PasswordHasher(
+    time_cost=settings.PASSWORD_HASH_TIME_COST,
+    memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+    parallelism=settings.PASSWORD_HASH_PARALLELISM,
+)
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+# Dedicated pool for hashing: each argon2 hash holds PASSWORD_HASH_MEMORY_COST KiB,
+# so concurrency is capped at the core count instead of the default executor's size
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/admin/login")
 
 
+async def run_password_op(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a password hash/verify call on the password pool, off the event loop.
+    
+    Args:
+        func: verify_password, hash_password or a wrapper of either
+        *args: Arguments for func
+        
+    Returns:
+        Whatever func returns
+    """
+    return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
 
 
 class AuthService:
@@ -36,6 +81,10 @@ class AuthService:
             redis_service: RedisService instance for token blocklisting
         """
         self.redis = redis_service
+        # In-process copy of the logout blocklist, reloaded every
+        # ADMIN_BLOCKLIST_REFRESH_SECONDS (same staleness bound as admin_token_cache)
+        self._blocklist: Set[str] = set()
+        self._blocklist_loaded_at = float("-inf")
     
     # ============================================================================
     # PASSWORD OPERATIONS
@@ -44,6 +93,8 @@ class AuthService:
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
         Verify a password against a hashed password.
+        Accepts argon2id hashes and legacy bcrypt hashes.
+        CPU/memory-bound: call via a thread from async code.
         
         Args:
             plain_password: Plain text password
@@ -52,11 +103,16 @@ class AuthService:
         Returns:
             bool: True if password matches, False otherwise
         """
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        if hashed_password.startswith(BCRYPT_PREFIXES):
+            return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     
     def hash_password(self, password: str) -> str:
         """
-        Hash a password.
+        Hash a password with argon2id.
         
         Args:
             password: Plain text password
@@ -64,7 +120,24 @@ class AuthService:
         Returns:
             str: Hashed password
         """
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return password_hasher.hash(password)
+    
+    def password_needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash should be upgraded (legacy bcrypt or outdated argon2 params).
+        
+        Args:
+            hashed_password: Stored password hash
+            
+        Returns:
+            bool: True if it should be re-hashed on next successful login
+        """
+        if hashed_password.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            return password_hasher.check_needs_rehash(hashed_password)
+        except InvalidHashError:
+            return True
     
     # ============================================================================
     # JWT TOKEN OPERATIONS
@@ -89,16 +162,16 @@ class AuthService:
         """
         to_encode = data.copy()
         
+        now = datetime.now(timezone.utc)
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-            to_encode.update({"exp": expire})
+            to_encode.update({"exp": now + expires_delta})
         
         to_encode.update({
-            "iat": datetime.now(timezone.utc),
+            "iat": now,
             "jti": str(uuid.uuid4())  # Unique token ID for blocklisting
         })
         
-        encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=settings.JWT_ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=JWT_ALGORITHM)
         return encoded_jwt
     
     def create_admin_tokens(self, username: str) -> tuple[str, str]:
@@ -114,14 +187,14 @@ class AuthService:
         access_token_expires = timedelta(minutes=30)
         access_token = self.create_access_token(
             data={"sub": username, "type": "access"},
-            secret_key=settings.ADMIN_JWT_SECRET_KEY,
+            secret_key=ADMIN_JWT_SECRET_KEY,
             expires_delta=access_token_expires
         )
         
         refresh_token_expires = timedelta(days=7)
         refresh_token = self.create_access_token(
             data={"sub": username, "type": "refresh"},
-            secret_key=settings.ADMIN_JWT_SECRET_KEY,
+            secret_key=ADMIN_JWT_SECRET_KEY,
             expires_delta=refresh_token_expires
         )
         
@@ -139,7 +212,7 @@ class AuthService:
         """
         return self.create_access_token(
             data={"sub": worker_id},
-            secret_key=settings.WORKER_JWT_SECRET_KEY,
+            secret_key=WORKER_JWT_SECRET_KEY,
             expires_delta=None
         )
     
@@ -147,10 +220,11 @@ class AuthService:
     # TOKEN VALIDATION
     # ============================================================================
     
-    def verify_admin_token(self, token: str) -> AdminUser:
+    async def verify_admin_token(self, token: str) -> AdminUser:
         """
         Verify admin JWT token and return user info.
         Checks if token is blocklisted (logged out).
+        Verified tokens are cached for a few seconds (see verify_cache).
         
         Args:
             token: JWT token to verify
@@ -167,12 +241,12 @@ class AuthService:
             headers={"WWW-Authenticate": "Bearer"},
         )
         
+        cached = admin_token_cache.get(token)
+        if cached is not None:
+            return cached
+        
         try:
-            payload = jwt.decode(
-                token,
-                settings.ADMIN_JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = get_verified_claims(token, ADMIN_JWT_SECRET_KEY, JWT_ALGORITHMS)
             username: str = payload.get("sub")
             jti: str = payload.get("jti")
             
@@ -180,18 +254,82 @@ class AuthService:
                 raise credentials_exception
             
             # Check if token is blocklisted (logged out)
-            if jti and self.is_token_blocklisted(jti):
+            if jti and await self.is_token_blocklisted_async(jti):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Token has been revoked",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             
-            return AdminUser(username=username, role="admin")
+            admin = AdminUser(username=username, role="admin")
+            admin_token_cache.set(token, admin, expires_at=payload.get("exp"))
+            return admin
             
         except JWTError:
             raise credentials_exception
     
+    async def verify_worker_token(self, token: str) -> Tuple[str, str]:
+        """
+        Verify a worker JWT and return the worker's info.
+        The token must match the worker's stored jwt_hash, so revoked tokens
+        are rejected. Verified tokens are cached for 30 seconds (see verify_cache).
+        
+        Args:
+            token: JWT token to verify
+            
+        Returns:
+            tuple: (worker_id, worker_name)
+            
+        Raises:
+            HTTPException: If the token is invalid or revoked, or the worker is gone
+        """
+        cached = worker_token_cache.get(token)
+        if cached is not None:
+            return cached
+        
+        try:
+            payload = get_verified_claims(
+                token,
+                WORKER_JWT_SECRET_KEY,
+                JWT_ALGORITHMS,
+                verify_exp=False  # Worker tokens don't expire
+            )
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        worker_id: str = payload.get("sub")
+        if not worker_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload"
+            )
+        
+        # Get worker info from Redis
+        worker_data = await async_redis_client.hgetall(f"worker:{worker_id}")
+        
+        if not worker_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Worker not found"
+            )
+        
+        # The hash must belong to this very token: a revoked (deleted) worker
+        # can't come back through a stray write re-creating its hash
+        if not hmac.compare_digest(self.hash_token(token), worker_data.get("jwt_hash", "")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Worker token revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        worker_info = (worker_id, worker_data.get("name", "Unknown"))
+        worker_token_cache.set(token, worker_info)
+        return worker_info
+    
     # ============================================================================
     # TOKEN BLOCKLIST (for logout)
     # ============================================================================
@@ -206,16 +344,60 @@ class AuthService:
         Returns:
             bool: True if token is blocklisted
         """
-        return self.redis.sismember("auth:admin_blocklist", jti)
+        return self.redis.zscore(ADMIN_BLOCKLIST_KEY, jti) is not None
     
-    def blocklist_token(self, jti: str) -> None:
+    async def is_token_blocklisted_async(self, jti: str) -> bool:
         """
-        Add token to blocklist (logout).
+        Check if token is in blocklist without blocking the event loop.
+        Answers from the in-process snapshot, reloading it from Redis at most
+        once per ADMIN_BLOCKLIST_REFRESH_SECONDS. Each reload first prunes jtis
+        whose tokens have expired, so the snapshot stays bounded.
         
         Args:
             jti: Token unique identifier
+            
+        Returns:
+            bool: True if token is blocklisted
+        """
+        now = time.monotonic()
+        if now - self._blocklist_loaded_at >= ADMIN_BLOCKLIST_REFRESH_SECONDS:
+            # Claim the refresh before awaiting so concurrent requests don't all reload
+            self._blocklist_loaded_at = now
+            try:
+                async with async_redis_client.pipeline(transaction=False) as pipe:
+                    pipe.zremrangebyscore(ADMIN_BLOCKLIST_KEY, "-inf", time.time())
+                    pipe.zrange(ADMIN_BLOCKLIST_KEY, 0, -1)
+                    _, jtis = await pipe.execute()
+                self._blocklist = set(jtis)
+            except Exception:
+                self._blocklist_loaded_at = float("-inf")
+                raise
+        return jti in self._blocklist
+    
+    async def blocklist_token(self, jti: str, expires_at: Union[float, str]) -> None:
+        """
+        Add token to blocklist (logout) without blocking the event loop.
+        
+        Args:
+            jti: Token unique identifier
+            expires_at: Token `exp` as a UNIX timestamp ("+inf" if none); the entry is pruned after it
+        """
+        await async_redis_client.zadd(ADMIN_BLOCKLIST_KEY, {jti: expires_at})
+        self._blocklist.add(jti)
+    
+    async def revoke_admin_token(self, token: str) -> None:
+        """
+        Blocklist an already-verified admin token and drop it from the verify cache.
+        
+        Args:
+            token: JWT token to revoke
         """
-        self.redis.sadd("auth:admin_blocklist", jti)
+        claims = jwt.decode(token, options={"verify_signature": False})
+        jti = claims.get("jti")
+        if jti:
+            # Tokens without exp never expire, so neither does their entry
+            await self.blocklist_token(jti, claims.get("exp", "+inf"))
+        admin_token_cache.pop(token)
     
     # ============================================================================
     # UTILITY
@@ -271,7 +453,7 @@ async def get_current_admin(token: str = Depends(oauth2_scheme)) -> AdminUser:
         AdminUser: Current admin user
     """
     auth_service = get_auth_service()
-    return auth_service.verify_admin_token(token)
+    return await auth_service.verify_admin_token(token)
 
 
 async def get_current_worker(token: str = Depends(oauth2_scheme)):
@@ -285,46 +467,12 @@ async def get_current_worker(token: str = Depends(oauth2_scheme)):
         WorkerUser: Current worker user
         
     Raises:
-        HTTPException: If token is invalid
+        HTTPException: If token is invalid or revoked
     """
     from app.schemas.user import WorkerUser
-    from app.core.redis_client import get_redis
-    
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate worker credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
     
-    try:
-        payload = jwt.decode(
-            token,
-            settings.WORKER_JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-            options={"verify_exp": False}  # Worker tokens don't expire
-        )
-        worker_id: str = payload.get("sub")
-        
-        if worker_id is None:
-            raise credentials_exception
-        
-        # Get worker info from Redis
-        r = get_redis()
-        worker_data = r.hgetall(f"worker:{worker_id}")
-        
-        if not worker_data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Worker not found"
-            )
-        
-        return WorkerUser(
-            worker_id=worker_id,
-            name=worker_data.get("name", "Unknown")
-        )
-        
-    except JWTError:
-        raise credentials_exception
+    worker_id, name = await get_auth_service().verify_worker_token(token)
+    return WorkerUser(worker_id=worker_id, name=name)
 
 
 # Backward compatibility exports
@@ -338,6 +486,11 @@ def get_password_hash(password: str) -> str:
     return get_auth_service().hash_password(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Backward compatibility wrapper."""
+    return get_auth_service().password_needs_rehash(hashed_password)
+
+
 def create_admin_tokens(username: str) -> tuple[str, str]:
     """Backward compatibility wrapper."""
     return get_auth_service().create_admin_tokens(username)
@@ -5,14 +5,25 @@ Refactored to class-based service with dependency injection.
 """
 import httpx
 import logging
+import orjson
 from typing import Optional
 from fastapi import HTTPException
 
 from app.core.config import get_settings
+from app.core.redis_client import async_redis_client
+from app.services.auth_service import AuthService
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Turnstile tokens are single-use and valid for 300s; remember seen ones that long
+TURNSTILE_SEEN_TTL = 300
+
+
+def turnstile_seen_key(token: str) -> str:
+    """Redis key marking a Turnstile token as already submitted."""
+    return f"turnstile:{AuthService.hash_token(token)}"
+
 
 class CaptchaService:
     """
@@ -28,11 +39,30 @@ class CaptchaService:
     
     @property
     def http_client(self) -> httpx.AsyncClient:
-        """Lazy-load HTTP client."""
+        """Lazy-load HTTP client (one pooled keep-alive client per process)."""
         if self._http_client is None:
-            self._http_client = httpx.AsyncClient()
+            # HTTP/2 multiplexes concurrent verifications over one TLS connection
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(3.0, connect=2.0),
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=30.0,
+                ),
+            )
         return self._http_client
     
+    async def warm_up(self) -> None:
+        """
+        Open the connection to Cloudflare ahead of the first verification.
+        Best effort: failures are logged and the first request connects instead.
+        """
+        try:
+            await self.http_client.head(self.verify_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Turnstile warm-up failed: {e}")
+    
     async def verify_turnstile(self, token: str) -> bool:
         """
         Verify Cloudflare Turnstile token.
@@ -52,6 +82,15 @@ class CaptchaService:
                 detail="Turnstile token required"
             )
         
+        # Claim the token before calling Cloudflare: replays are rejected
+        # without the external round trip
+        seen_key = turnstile_seen_key(token)
+        if not await async_redis_client.set(seen_key, "used", nx=True, ex=TURNSTILE_SEEN_TTL):
+            raise HTTPException(
+                status_code=403, 
+                detail="Turnstile token already used"
+            )
+        
         try:
             response = await self.http_client.post(
                 self.verify_url,
@@ -60,7 +99,7 @@ class CaptchaService:
                     "response": token
                 }
             )
-            result = response.json()
+            result = orjson.loads(response.content)
             
             if not result.get("success"):
                 logger.warning(f"Turnstile verification failed: {result}")
@@ -73,6 +112,8 @@ class CaptchaService:
             
         except httpx.HTTPError as e:
             logger.error(f"Turnstile HTTP error: {e}")
+            # Not the token's fault: let the client retry with it
+            await async_redis_client.delete(seen_key)
             raise HTTPException(
                 status_code=500, 
                 detail="CAPTCHA verification service unavailable"
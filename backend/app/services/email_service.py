@@ -6,7 +6,6 @@ Refactored to class-based service with dependency injection.
 import logging
 from typing import Optional
 from pathlib import Path
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from pydantic import EmailStr
 
 from app.core.config import get_settings
@@ -28,6 +27,8 @@ class EmailService:
             logger.warning("Email service not configured - MAIL_USERNAME or MAIL_PASSWORD missing")
             self._mailer = None
         else:
+            # Imported only when mail is configured; fastapi_mail is heavy to load
+            from fastapi_mail import ConnectionConfig, FastMail
             config = ConnectionConfig(
                 MAIL_USERNAME=settings.MAIL_USERNAME,
                 MAIL_PASSWORD=settings.MAIL_PASSWORD,
@@ -66,6 +67,7 @@ class EmailService:
             logger.error("Cannot send email - mailer not configured")
             return False
         
+        from fastapi_mail import MessageSchema, MessageType
         try:
             message = MessageSchema(
                 subject=subject,
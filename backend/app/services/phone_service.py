@@ -3,12 +3,67 @@
 PhoneService - Handles phone number report operations.
 Refactored to class-based service with dependency injection.
 """
-from typing import Optional, List, Dict, Tuple
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Any, Optional, List, Dict, Mapping, Tuple
+from sqlalchemy import bindparam, delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
 
 from app.models.phone_report import PhoneReport, ReportType, ReportStatus
 
+# Cache-aside for the public phone search (see admin_phones.search_phone).
+# Keyed by the exact number, matching the exact-match DB lookup.
+PHONE_LOOKUP_TTL = 60  # seconds
+
+
+def phone_lookup_key(phone_number: str) -> str:
+    """Redis key caching search results for a phone number."""
+    return f"phone:lookup:{phone_number}"
+
+
+# Dashboard stats are polled by every open admin tab; share one computation
+# across clients and processes for a few seconds (see admin_phones.phone_report_stats).
+PHONE_STATS_KEY = "stats:phone"
+PHONE_STATS_TTL = 3  # seconds
+
+
+# Admin listing pages by (created_at, id) keyset cursors, encoded as "<iso timestamp>,<id>"
+def encode_list_cursor(created_at: datetime, report_id: int) -> str:
+    """Opaque cursor pointing just past the given row (UTC with "Z", so it is URL-safe)."""
+    created_at = created_at.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    return f"{created_at},{report_id}"
+
+
+def decode_list_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor from encode_list_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, _, report_id = cursor.rpartition(",")
+    return datetime.fromisoformat(created_at), int(report_id)
+
+
+# Max IDs per bulk UPDATE/DELETE statement (all chunks still share one transaction)
+BULK_CHUNK_SIZE = 10_000
+
+
+# Dashboard counters in a single query
+SELECT_STATS = select(
+    func.count().label("total"),
+    func.count().filter(PhoneReport.status == ReportStatus.approved).label("approved"),
+    func.count().filter(PhoneReport.status == ReportStatus.rejected).label("rejected"),
+    func.count().filter(PhoneReport.status == ReportStatus.pending).label("pending"),
+).select_from(PhoneReport)
+
+
+# Hot exact-match lookup, built once; the bound parameter keeps it one compiled-cache entry
+SELECT_BY_PHONE_NUMBER = select(PhoneReport).where(
+    PhoneReport.phone_number == bindparam("phone_number")
+)
+
 
 class PhoneService:
     """
@@ -20,9 +75,9 @@ class PhoneService:
     # REPORT CREATION & UPDATES
     # ============================================================================
     
-    def create_report(
+    async def create_report(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         phone_number: str, 
         report_type: ReportType, 
         email: Optional[str] = None
@@ -39,31 +94,39 @@ class PhoneService:
         Returns:
             PhoneReport: Created or updated report
         """
-        # Check if report already exists
-        existing = db.query(PhoneReport).filter(
-            PhoneReport.phone_number == phone_number
-        ).first()
-        
-        if existing:
-            # Increment count for existing report
-            existing.count += 1
-            existing.updated_at = func.now()
-            db.commit()
-            db.refresh(existing)
-            return existing
-        
-        # Create new report
-        report = PhoneReport(
-            phone_number=phone_number, 
-            report_type=report_type, 
-            reported_by_email=email
+        # Single upsert on the unique phone_number: no check-then-insert race between
+        # concurrent reporters, and one round trip instead of two
+        stmt = (
+            pg_insert(PhoneReport)
+            .values(phone_number=phone_number, report_type=report_type, reported_by_email=email)
+            .on_conflict_do_update(
+                index_elements=[PhoneReport.phone_number],
+                set_={"count": PhoneReport.count + 1, "updated_at": func.now()},
+            )
+            .returning(PhoneReport)
+        )
+        report = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+        return report
+    
+    async def _update_returning(
+        self,
+        db: AsyncSession,
+        report_id: int,
+        **values: Any
+    ) -> Optional[PhoneReport]:
+        """UPDATE ... RETURNING one report and commit; one round trip instead of get + refresh."""
+        stmt = (
+            update(PhoneReport)
+            .where(PhoneReport.id == report_id)
+            .values(**values)
+            .returning(PhoneReport)
         )
-        db.add(report)
-        db.commit()
-        db.refresh(report)
+        report = (await db.execute(stmt)).scalar_one_or_none()
+        await db.commit()
         return report
     
-    def approve_report(self, db: Session, report_id: int) -> Optional[PhoneReport]:
+    async def approve_report(self, db: AsyncSession, report_id: int) -> Optional[PhoneReport]:
         """
         Approve a phone number report.
         
@@ -74,17 +137,11 @@ class PhoneService:
         Returns:
             PhoneReport: Updated report or None if not found
         """
-        report = db.query(PhoneReport).filter(PhoneReport.id == report_id).first()
-        if report:
-            report.status = ReportStatus.approved
-            db.commit()
-            db.refresh(report)
-            return report
-        return None
+        return await self._update_returning(db, report_id, status=ReportStatus.approved)
     
-    def reject_report(
+    async def reject_report(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         report_id: int, 
         note: str = ""
     ) -> Optional[PhoneReport]:
@@ -99,16 +156,9 @@ class PhoneService:
         Returns:
             PhoneReport: Updated report or None if not found
         """
-        report = db.query(PhoneReport).filter(PhoneReport.id == report_id).first()
-        if report:
-            report.status = ReportStatus.rejected
-            report.notes = note
-            db.commit()
-            db.refresh(report)
-            return report
-        return None
+        return await self._update_returning(db, report_id, status=ReportStatus.rejected, notes=note)
     
-    def delete_report(self, db: Session, report_id: int) -> bool:
+    async def delete_report(self, db: AsyncSession, report_id: int) -> Optional[PhoneReport]:
         """
         Delete a phone number report.
         
@@ -117,54 +167,131 @@ class PhoneService:
             report_id: Report ID
             
         Returns:
-            bool: True if deleted, False if not found
+            PhoneReport: Deleted report or None if not found
         """
-        report = db.query(PhoneReport).filter(PhoneReport.id == report_id).first()
+        report = await db.get(PhoneReport, report_id)
         if report:
-            db.delete(report)
-            db.commit()
-            return True
-        return False
+            await db.delete(report)
+            await db.commit()
+            return report
+        return None
+    
+    # ============================================================================
+    # BULK MODERATION
+    # ============================================================================
+    
+    async def approve_reports(self, db: AsyncSession, report_ids: List[int]) -> List[str]:
+        """
+        Approve many reports with one UPDATE per BULK_CHUNK_SIZE IDs and a single commit.
+        
+        Args:
+            db: Database session
+            report_ids: Report IDs (unknown IDs are ignored)
+            
+        Returns:
+            list: Phone numbers of the updated reports
+        """
+        stmt = update(PhoneReport).values(status=ReportStatus.approved)
+        return await self._bulk_execute(db, stmt, report_ids)
+    
+    async def reject_reports(self, db: AsyncSession, report_ids: List[int], note: str = "") -> List[str]:
+        """
+        Reject many reports with one UPDATE per BULK_CHUNK_SIZE IDs and a single commit.
+        
+        Args:
+            db: Database session
+            report_ids: Report IDs (unknown IDs are ignored)
+            note: Rejection note
+            
+        Returns:
+            list: Phone numbers of the updated reports
+        """
+        stmt = update(PhoneReport).values(status=ReportStatus.rejected, notes=note)
+        return await self._bulk_execute(db, stmt, report_ids)
+    
+    async def delete_reports(self, db: AsyncSession, report_ids: List[int]) -> List[str]:
+        """
+        Delete many reports with one DELETE per BULK_CHUNK_SIZE IDs and a single commit.
+        
+        Args:
+            db: Database session
+            report_ids: Report IDs (unknown IDs are ignored)
+            
+        Returns:
+            list: Phone numbers of the deleted reports
+        """
+        return await self._bulk_execute(db, delete(PhoneReport), report_ids)
+    
+    async def _bulk_execute(self, db: AsyncSession, stmt, report_ids: List[int]) -> List[str]:
+        stmt = (
+            stmt.where(PhoneReport.id.in_(bindparam("ids", expanding=True)))
+            .returning(PhoneReport.phone_number)
+            .execution_options(synchronize_session=False)
+        )
+        phone_numbers: List[str] = []
+        for start in range(0, len(report_ids), BULK_CHUNK_SIZE):
+            result = await db.execute(stmt, {"ids": report_ids[start:start + BULK_CHUNK_SIZE]})
+            phone_numbers.extend(result.scalars())
+        await db.commit()
+        return phone_numbers
     
     # ============================================================================
     # QUERIES
     # ============================================================================
     
-    def list_reports(
+    async def list_reports(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         skip: int = 0, 
         limit: int = 100,
         status: Optional[ReportStatus] = None,
-        phone_number: Optional[str] = None
-    ) -> Tuple[List[PhoneReport], int]:
+        phone_number: Optional[str] = None,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[List[Mapping[str, Any]], Optional[int]]:
         """
-        List phone number reports with pagination and filtering.
+        List phone number reports with pagination and filtering, newest first.
+        Returns plain column rows rather than ORM instances (read-only listing).
+        With a cursor, pages by keyset (an index range scan, independent of depth)
+        and skips the total count.
         
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored with a cursor)
             limit: Max number of records to return
             status: Filter by status
             phone_number: Filter by phone number (partial match)
+            cursor: (created_at, id) of the last row of the previous page
             
         Returns:
-            tuple: (List of reports, Total count)
+            tuple: (List of report rows, Total count or None when paging by cursor)
         """
-        query = db.query(PhoneReport)
-        
+        columns = PhoneReport.__table__.columns
+        filters = []
         if status:
-            query = query.filter(PhoneReport.status == status)
-            
+            filters.append(PhoneReport.status == status)
         if phone_number:
-            query = query.filter(PhoneReport.phone_number.contains(phone_number))
-            
-        total = query.count()
-        reports = query.order_by(PhoneReport.created_at.desc()).offset(skip).limit(limit).all()
+            filters.append(PhoneReport.phone_number.contains(phone_number))
+        order = (PhoneReport.created_at.desc(), PhoneReport.id.desc())
         
-        return reports, total
+        if cursor is not None:
+            filters.append(tuple_(PhoneReport.created_at, PhoneReport.id) < tuple_(*cursor))
+            result = await db.execute(select(*columns).where(*filters).order_by(*order).limit(limit))
+            return result.mappings().all(), None
+        
+        # Total comes from COUNT(*) OVER () on the page query itself: one round trip
+        result = await db.execute(
+            select(*columns, func.count().over().label("total_count"))
+            .where(*filters).order_by(*order).offset(skip).limit(limit)
+        )
+        rows = result.all()
+        if not rows:
+            # Past the last page (or nothing matches): the window has no row to report on
+            total = await db.scalar(select(func.count()).select_from(PhoneReport).where(*filters)) if skip else 0
+            return [], total
+        keys = list(result.keys())[:-1]
+        return [dict(zip(keys, row)) for row in rows], rows[0].total_count
     
-    def search_phone_report(self, db: Session, phone_number: str) -> Optional[PhoneReport]:
+    async def search_phone_report(self, db: AsyncSession, phone_number: str) -> Optional[PhoneReport]:
         """
         Search for a phone number report.
         
@@ -175,11 +302,10 @@ class PhoneService:
         Returns:
             PhoneReport: Report or None if not found
         """
-        return db.query(PhoneReport).filter(
-            PhoneReport.phone_number == phone_number
-        ).first()
+        result = await db.execute(SELECT_BY_PHONE_NUMBER, {"phone_number": phone_number})
+        return result.scalars().first()
     
-    def get_stats(self, db: Session) -> Dict[str, int]:
+    async def get_stats(self, db: AsyncSession) -> Dict[str, int]:
         """
         Get phone report statistics.
         
@@ -189,18 +315,9 @@ class PhoneService:
         Returns:
             dict: Statistics (total, approved, rejected, pending counts)
         """
-        return {
-            "total": db.query(PhoneReport).count(),
-            "approved": db.query(PhoneReport).filter(
-                PhoneReport.status == ReportStatus.approved
-            ).count(),
-            "rejected": db.query(PhoneReport).filter(
-                PhoneReport.status == ReportStatus.rejected
-            ).count(),
-            "pending": db.query(PhoneReport).filter(
-                PhoneReport.status == ReportStatus.pending
-            ).count(),
-        }
+        # One scan with conditional aggregation (COUNT(*) FILTER (WHERE ...) on Postgres)
+        row = (await db.execute(SELECT_STATS)).one()
+        return {"total": row.total, "approved": row.approved, "rejected": row.rejected, "pending": row.pending}
 
 
 # ============================================================================
@@ -227,36 +344,51 @@ def get_phone_service() -> PhoneService:
 # BACKWARD COMPATIBILITY
 # ============================================================================
 
-def create_report(db: Session, phone_number: str, report_type: ReportType, email: str = None):
+async def create_report(db: AsyncSession, phone_number: str, report_type: ReportType, email: str = None):
+    """Backward compatibility wrapper."""
+    return await get_phone_service().create_report(db, phone_number, report_type, email)
+
+
+async def list_reports(db: AsyncSession, skip: int = 0, limit: int = 100, status: Optional[ReportStatus] = None, phone_number: Optional[str] = None, cursor: Optional[Tuple[datetime, int]] = None):
+    """Backward compatibility wrapper."""
+    return await get_phone_service().list_reports(db, skip, limit, status, phone_number, cursor)
+
+
+async def approve_report(db: AsyncSession, report_id: int):
+    """Backward compatibility wrapper."""
+    return await get_phone_service().approve_report(db, report_id)
+
+
+async def reject_report(db: AsyncSession, report_id: int, note: str = ""):
     """Backward compatibility wrapper."""
-    return get_phone_service().create_report(db, phone_number, report_type, email)
+    return await get_phone_service().reject_report(db, report_id, note)
 
 
-def list_reports(db: Session, skip: int = 0, limit: int = 100, status: Optional[ReportStatus] = None, phone_number: Optional[str] = None):
+async def delete_report(db: AsyncSession, report_id: int):
     """Backward compatibility wrapper."""
-    return get_phone_service().list_reports(db, skip, limit, status, phone_number)
+    return await get_phone_service().delete_report(db, report_id)
 
 
-def approve_report(db: Session, report_id: int):
+async def approve_reports(db: AsyncSession, report_ids: List[int]):
     """Backward compatibility wrapper."""
-    return get_phone_service().approve_report(db, report_id)
+    return await get_phone_service().approve_reports(db, report_ids)
 
 
-def reject_report(db: Session, report_id: int, note: str = ""):
+async def reject_reports(db: AsyncSession, report_ids: List[int], note: str = ""):
     """Backward compatibility wrapper."""
-    return get_phone_service().reject_report(db, report_id, note)
+    return await get_phone_service().reject_reports(db, report_ids, note)
 
 
-def delete_report(db: Session, report_id: int):
+async def delete_reports(db: AsyncSession, report_ids: List[int]):
     """Backward compatibility wrapper."""
-    return get_phone_service().delete_report(db, report_id)
+    return await get_phone_service().delete_reports(db, report_ids)
 
 
-def get_stats(db: Session):
+async def get_stats(db: AsyncSession):
     """Backward compatibility wrapper."""
-    return get_phone_service().get_stats(db)
+    return await get_phone_service().get_stats(db)
 
 
-def search_phone_report(db: Session, phone_number: str):
+async def search_phone_report(db: AsyncSession, phone_number: str):
     """Backward compatibility wrapper."""
-    return get_phone_service().search_phone_report(db, phone_number)
\ No newline at end of file
+    return await get_phone_service().search_phone_report(db, phone_number)
\ No newline at end of file
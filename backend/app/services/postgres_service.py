@@ -4,14 +4,18 @@ PostgresService - Centralized PostgreSQL operations with proper encapsulation.
 Provides a clean interface for database operations used throughout the application.
 """
 import logging
+import time
 from typing import Optional, Generator
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from contextlib import contextmanager
-from app.core.postgres_client import SessionLocal, get_db
+from app.core.postgres_client import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Probes within this window reuse the last health check result
+HEALTH_CHECK_CACHE_SECONDS = 1.0
+
 
 class PostgresService:
     """
@@ -27,6 +31,8 @@ class PostgresService:
             session_factory: SQLAlchemy session factory. If None, uses default.
         """
         self.session_factory = session_factory or SessionLocal
+        self._health_ok = False
+        self._health_checked_at = float("-inf")
     
     # ============================================================================
     # SESSION MANAGEMENT
@@ -93,18 +99,25 @@ class PostgresService:
     def health_check(self) -> bool:
         """
         Check database connection health.
+        Runs SELECT 1 on a bare pooled connection (no Session) at most once
+        per HEALTH_CHECK_CACHE_SECONDS, so probe storms cost one query.
         
         Returns:
             bool: True if connection is healthy
         """
+        now = time.monotonic()
+        if now - self._health_checked_at < HEALTH_CHECK_CACHE_SECONDS:
+            return self._health_ok
+        
         try:
-            session = next(get_db())
-            session.execute(text("SELECT 1"))
-            session.close()
-            return True
+            with self.session_factory.kw["bind"].connect() as conn:
+                conn.execute(text("SELECT 1"))
+            self._health_ok = True
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
-            return False
+            self._health_ok = False
+        self._health_checked_at = now
+        return self._health_ok
 
 
 # Singleton instance
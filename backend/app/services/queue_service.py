@@ -3,17 +3,262 @@
 QueueService - Handles distributed task queue operations with Redis.
 Refactored to class-based service with dependency injection.
 """
-import json
+import asyncio
+import orjson
 import time
 import datetime
-from typing import Optional, Dict, Any
+from itertools import chain
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import timezone
 
 from app.core.config import get_settings
+from app.core.redis_client import async_redis_client, async_blocking_client
 from app.services.redis_service import RedisService
 
 settings = get_settings()
 TASK_TIMEOUT = settings.TASK_TIMEOUT_SECONDS
+COMPLETED_TASK_TTL = settings.COMPLETED_TASK_TTL_SECONDS
+
+# queue:pending:idx mirrors queue:pending as a zset scored by a monotonic
+# enqueue counter, so a task's position is a ZRANK instead of a list scan.
+# Every push/pop of queue:pending goes through these scripts to keep it in sync.
+
+# KEYS: task hash, pending list, processing zset, pending index, seq counter, all-tasks zset
+# ARGV: task_id, created timestamp, then field/value pairs of the task hash
+# Returns the task's queue position (tasks ahead of it + 1) in one round trip.
+ENQUEUE_TASK_LUA = """
+local position = redis.call('LLEN', KEYS[2]) + redis.call('ZCARD', KEYS[3]) + 1
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('LPUSH', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[4], redis.call('INCR', KEYS[5]), ARGV[1])
+redis.call('ZADD', KEYS[6], ARGV[2], ARGV[1])
+return position
+"""
+
+# KEYS: pending list, pending index, seq counter
+# ARGV: task_id
+PUSH_PENDING_LUA = """
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[2], redis.call('INCR', KEYS[3]), ARGV[1])
+"""
+
+# KEYS: pending list, pending index
+POP_PENDING_LUA = """
+local task_id = redis.call('RPOP', KEYS[1])
+if task_id then
+    redis.call('ZREM', KEYS[2], task_id)
+end
+return task_id
+"""
+
+# KEYS: worker handoff list, pending index, processing zset, task hash
+# ARGV: task_id, start timestamp, started_at (ISO), worker_id
+# Claims a task BLMOVEd into the worker's handoff list: marks it STARTED in the
+# processing zset and returns its hash as a flat field/value list (empty if the
+# task hash is gone, or if the janitor already returned it to pending).
+CLAIM_TASK_LUA = """
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return {}
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+if redis.call('EXISTS', KEYS[4]) == 0 then
+    return {}
+end
+redis.call('ZADD', KEYS[3], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[4], 'status', 'STARTED', 'started_at', ARGV[3], 'worker_id', ARGV[4])
+return redis.call('HGETALL', KEYS[4])
+"""
+
+# KEYS: pending list, pending index, processing zset
+# ARGV: start timestamp, started_at (ISO), worker_id
+# Non-blocking pop + claim in one round trip: returns false if the queue is empty,
+# else the task hash as a flat field/value list (empty if the hash is gone).
+# The task hash key is derived from the popped id, so it can't be declared in KEYS.
+DISPATCH_TASK_LUA = """
+local task_id = redis.call('RPOP', KEYS[1])
+if not task_id then
+    return false
+end
+redis.call('ZREM', KEYS[2], task_id)
+local task_key = 'task:' .. task_id
+if redis.call('EXISTS', task_key) == 0 then
+    return {}
+end
+redis.call('ZADD', KEYS[3], ARGV[1], task_id)
+redis.call('HSET', task_key, 'status', 'STARTED', 'started_at', ARGV[2], 'worker_id', ARGV[3])
+return redis.call('HGETALL', task_key)
+"""
+
+# KEYS: pending index, pending list, processing zset
+# ARGV: task_id
+# Returns {pending rank or -1, pending count, processing count} from one atomic snapshot.
+TASK_ETA_LUA = """
+local rank = redis.call('ZRANK', KEYS[1], ARGV[1])
+return {rank or -1, redis.call('LLEN', KEYS[2]), redis.call('ZCARD', KEYS[3])}
+"""
+
+# KEYS: failed zset, pending list, pending index, seq counter
+# ARGV: max tasks to move
+# Moves up to ARGV[1] failed tasks back to pending in one atomic call and returns
+# how many moved. Task hash keys are derived from the ids, as in DISPATCH_TASK_LUA.
+REQUEUE_FAILED_LUA = """
+local ids = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+for _, task_id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], task_id)
+    redis.call('LPUSH', KEYS[2], task_id)
+    redis.call('ZADD', KEYS[3], redis.call('INCR', KEYS[4]), task_id)
+    redis.call('HSET', 'task:' .. task_id, 'status', 'PENDING')
+end
+return #ids
+"""
+# KEYS: processing zset, failed zset, task hash
+# ARGV: task_id, failure timestamp, traceback
+# Moves a task from processing to failed, bumping its retries counter server-side.
+# Returns the new retries count, or false (without touching failed) if the hash is gone.
+FAIL_TASK_LUA = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    return false
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+local retries = redis.call('HINCRBY', KEYS[3], 'retries', 1)
+redis.call('HSET', KEYS[3], 'status', 'FAILURE', 'traceback', ARGV[3])
+return retries
+"""
+
+# KEYS: processing zset, failed zset, pending list, pending index, seq counter
+# ARGV: cutoff timestamp, max retries, now, traceback, max tasks
+# Reaps tasks started before the cutoff (their worker presumably died): requeues
+# each to pending, or fails it once retry_count reaches max retries. Only stale
+# ids are read, via ZRANGEBYSCORE. Returns {requeued, failed, ids reaped}.
+REAP_TIMED_OUT_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[5]))
+local requeued, failed = 0, 0
+for _, task_id in ipairs(ids) do
+    redis.call('ZREM', KEYS[1], task_id)
+    local task_key = 'task:' .. task_id
+    if redis.call('EXISTS', task_key) == 1 then
+        local retry_count = tonumber(redis.call('HGET', task_key, 'retry_count') or '0')
+        if retry_count >= tonumber(ARGV[2]) then
+            redis.call('ZADD', KEYS[2], ARGV[3], task_id)
+            redis.call('HINCRBY', task_key, 'retries', 1)
+            redis.call('HSET', task_key, 'status', 'FAILURE', 'traceback', ARGV[4])
+            failed = failed + 1
+        else
+            redis.call('LPUSH', KEYS[3], task_id)
+            redis.call('ZADD', KEYS[4], redis.call('INCR', KEYS[5]), task_id)
+            redis.call('HINCRBY', task_key, 'retry_count', 1)
+            redis.call('HSET', task_key, 'status', 'PENDING')
+            requeued = requeued + 1
+        end
+    end
+end
+return {requeued, failed, #ids}
+"""
+
+# KEYS: worker handoff list, pending list
+# ARGV: task ids to return
+# Moves task ids stranded in a handoff list (BLMOVEd but never claimed) back to
+# the consuming end of pending. Their pending index entries were never removed,
+# so positions stay consistent. Returns how many were returned.
+RETURN_HANDOFF_LUA = """
+local returned = 0
+for _, task_id in ipairs(ARGV) do
+    if redis.call('LREM', KEYS[1], 0, task_id) > 0 then
+        redis.call('RPUSH', KEYS[2], task_id)
+        returned = returned + 1
+    end
+end
+return returned
+"""
+
+HANDOFF_PATTERN = "queue:processing:*"
+
+# Bounds how long one requeue call holds the (single-threaded) Redis server
+REQUEUE_BATCH_SIZE = 1000
+
+PENDING_KEYS = ["queue:pending", "queue:pending:idx", "queue:pending:seq"]
+# Every task scored by creation time, so unfiltered listings are one ZREVRANGE
+ALL_TASKS_KEY = "queue:all_tasks"
+# Task hash fields listings need; skips the payload/result/traceback blobs
+TASK_SUMMARY_FIELDS = ("task_id", "status", "created_at", "worker_id", "retries", "eta")
+TASK_ETA_KEYS = ["queue:pending:idx", "queue:pending", "queue:processing"]
+
+
+def _now() -> Tuple[float, str]:
+    """One clock read as (epoch seconds for zset scores, ISO-8601 UTC for task hashes)."""
+    now = time.time()
+    return now, datetime.datetime.fromtimestamp(now, timezone.utc).isoformat()
+
+
+def _new_task(
+    task_id: str,
+    payload: dict,
+    email_notify: Optional[str] = None,
+    eta: Optional[int] = None,
+    expires: Optional[datetime.datetime] = None
+) -> Tuple[Dict[str, Any], Dict[str, list]]:
+    """
+    Build a new task's hash fields and the ENQUEUE_TASK_LUA call for them.
+    
+    Returns:
+        tuple: (task fields, {"keys": ..., "args": ...} for the script)
+    """
+    created_ts, created_at = _now()
+    task_data = {
+        "task_id": task_id,
+        "status": "PENDING",
+        "payload": orjson.dumps(payload),
+        "created_at": created_at,
+        "retries": "0",
+        "traceback": "",
+        "worker_id": "",
+        "eta": eta or settings.AVG_WAIT_TIME_SECONDS,
+        "expires": expires.isoformat() if expires else "",
+        "email_notify": email_notify or "none"
+    }
+    script_call = {
+        "keys": [f"task:{task_id}", "queue:pending", "queue:processing", *PENDING_KEYS[1:], ALL_TASKS_KEY],
+        "args": [task_id, created_ts, *chain.from_iterable(task_data.items())],
+    }
+    return task_data, script_call
+
+def _task_summary(values: list) -> Optional[Dict[str, Any]]:
+    """Zip an HMGET of TASK_SUMMARY_FIELDS into a dict; None if the task hash is gone."""
+    if all(value is None for value in values):
+        return None
+    return dict(zip(TASK_SUMMARY_FIELDS, values))
+
+
+def _queue_task_page(pipe, status: Optional[str], start: int, stop: int) -> None:
+    """Queue the page-of-ids and queue-size reads for list_tasks on a (sync or async) pipeline."""
+    if status == "pending":
+        pipe.lrange("queue:pending", start, stop)
+        pipe.llen("queue:pending")
+    elif status == "processing":
+        pipe.zrange("queue:processing", start, stop)
+        pipe.zcard("queue:processing")
+    elif status == "failed":
+        pipe.zrange("queue:failed", start, stop)
+        pipe.zcard("queue:failed")
+    else:
+        pipe.zrevrange(ALL_TASKS_KEY, start, stop)
+        pipe.zcard(ALL_TASKS_KEY)
+
+
+def _queue_complete(pipe, task_id: str, result: dict) -> None:
+    """Queue complete_task's writes on a (sync or async) pipeline."""
+    pipe.zrem("queue:processing", task_id)
+    pipe.hset(
+        f"task:{task_id}", 
+        mapping={
+            "status": "SUCCESS",
+            "result": orjson.dumps(result),
+            "completed_at": _now()[1]
+        }
+    )
+    pipe.expire(f"task:{task_id}", COMPLETED_TASK_TTL)
+    pipe.zrem(ALL_TASKS_KEY, task_id)
 
 
 class QueueService:
@@ -30,6 +275,14 @@ class QueueService:
             redis_service: RedisService instance for queue operations
         """
         self.redis = redis_service
+        self._enqueue_script = redis_service.register_script(ENQUEUE_TASK_LUA)
+        self._push_pending_script = redis_service.register_script(PUSH_PENDING_LUA)
+        self._pop_pending_script = redis_service.register_script(POP_PENDING_LUA)
+        self._requeue_failed_script = redis_service.register_script(REQUEUE_FAILED_LUA)
+        self._dispatch_script = redis_service.register_script(DISPATCH_TASK_LUA)
+        self._fail_script = redis_service.register_script(FAIL_TASK_LUA)
+        self._reap_script = redis_service.register_script(REAP_TIMED_OUT_LUA)
+        self._return_handoff_script = redis_service.register_script(RETURN_HANDOFF_LUA)
     
     # ============================================================================
     # TASK ENQUEUE
@@ -42,7 +295,7 @@ class QueueService:
         email_notify: Optional[str] = None, 
         eta: Optional[int] = None, 
         expires: Optional[datetime.datetime] = None
-    ) -> None:
+    ) -> Dict[str, Any]:
         """
         Enqueue a new task to the pending queue.
         
@@ -52,30 +305,48 @@ class QueueService:
             email_notify: Optional email for notifications
             eta: Estimated time to completion in seconds
             expires: Task expiration datetime
+            
+        Returns:
+            dict: Stored task fields plus "queue_position"
         """
-        task_key = f"task:{task_id}"
-        task_data = {
-            "task_id": task_id,
-            "status": "PENDING",
-            "payload": json.dumps(payload),
-            "created_at": datetime.datetime.now(timezone.utc).isoformat(),
-            "retries": "0",
-            "traceback": "",
-            "worker_id": "",
-            "eta": eta or settings.AVG_WAIT_TIME_SECONDS,
-            "expires": expires.isoformat() if expires else "",
-            "email_notify": email_notify or "none"
-        }
+        task_data, script_call = _new_task(task_id, payload, email_notify, eta, expires)
+        task_data["queue_position"] = self._enqueue_script(**script_call)
+        return task_data
+    
+    def push_pending(self, pipe, task_id: str) -> None:
+        """
+        Queue a push of task_id onto the pending queue (and its index) on a pipeline.
         
-        pipe = self.redis.pipeline(transaction=True)
-        pipe.hset(task_key, mapping=task_data)
-        pipe.lpush("queue:pending", task_id)
-        pipe.execute()
+        Args:
+            pipe: Pipeline the push is added to
+            task_id: Task identifier
+        """
+        self._push_pending_script(keys=PENDING_KEYS, args=[task_id], client=pipe)
     
     # ============================================================================
     # TASK LIFECYCLE
     # ============================================================================
     
+    def claim_next_task(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Pop the next pending task and mark it STARTED in one atomic script call.
+        Unlike get_next_pending_task + start_processing, a crash in between
+        can't drop the task: it is in queue:processing as soon as it leaves pending.
+        
+        Args:
+            worker_id: Worker identifier
+            
+        Returns:
+            dict: Task data, or None if the queue is empty (or the task was deleted)
+        """
+        flat = self._dispatch_script(
+            keys=PENDING_KEYS[:2] + ["queue:processing"],
+            args=[*_now(), worker_id],
+        )
+        if flat is None:
+            return None
+        return dict(zip(flat[::2], flat[1::2])) or None
+    
     def start_processing(self, task_id: str, worker_id: str) -> None:
         """
         Mark task as started/processing.
@@ -84,14 +355,14 @@ class QueueService:
             task_id: Task identifier
             worker_id: Worker identifier
         """
-        start_time = time.time()
+        start_time, started_at = _now()
         pipe = self.redis.pipeline(transaction=True)
         pipe.zadd("queue:processing", {task_id: start_time})
         pipe.hset(
             f"task:{task_id}", 
             mapping={
                 "status": "STARTED", 
-                "started_at": datetime.datetime.now(timezone.utc).isoformat(), 
+                "started_at": started_at, 
                 "worker_id": worker_id
             }
         )
@@ -99,46 +370,33 @@ class QueueService:
     
     def complete_task(self, task_id: str, result: dict) -> None:
         """
-        Mark task as completed successfully.
+        Mark task as completed successfully. The task hash expires after
+        COMPLETED_TASK_TTL, after which get_task_data returns an empty dict for it.
         
         Args:
             task_id: Task identifier
             result: Task result data
         """
-        pipe = self.redis.pipeline(transaction=True)
-        pipe.zrem("queue:processing", task_id)
-        pipe.hset(
-            f"task:{task_id}", 
-            mapping={
-                "status": "SUCCESS",
-                "result": json.dumps(result),
-                "completed_at": datetime.datetime.now(timezone.utc).isoformat()
-            }
-        )
+        # No MULTI needed: nothing else touches a task once it leaves processing
+        pipe = self.redis.pipeline(transaction=False)
+        _queue_complete(pipe, task_id, result)
         pipe.execute()
     
-    def fail_task(self, task_id: str, traceback: str) -> None:
+    def fail_task(self, task_id: str, traceback: str) -> Optional[int]:
         """
-        Mark task as failed.
+        Mark task as failed (one atomic script call; retries is incremented server-side).
         
         Args:
             task_id: Task identifier
             traceback: Error traceback
+            
+        Returns:
+            int: New retries count, or None if the task no longer exists
         """
-        retries = int(self.redis.hget(f"task:{task_id}", "retries") or 0) + 1
-        
-        pipe = self.redis.pipeline(transaction=True)
-        pipe.zrem("queue:processing", task_id)
-        pipe.zadd("queue:failed", {task_id: time.time()})
-        pipe.hset(
-            f"task:{task_id}", 
-            mapping={
-                "status": "FAILURE",
-                "traceback": traceback,
-                "retries": str(retries)
-            }
+        return self._fail_script(
+            keys=["queue:processing", "queue:failed", f"task:{task_id}"],
+            args=[task_id, time.time(), traceback],
         )
-        pipe.execute()
     
     def retry_task(self, task_id: str) -> None:
         """
@@ -147,10 +405,12 @@ class QueueService:
         Args:
             task_id: Task identifier
         """
-        pipe = self.redis.pipeline(transaction=True)
-        pipe.zrem("queue:processing", task_id)
-        pipe.lpush("queue:pending", task_id)
+        # Status is written before the push so a worker claiming the task
+        # right away can't have its STARTED overwritten; no MULTI needed
+        pipe = self.redis.pipeline(transaction=False)
         pipe.hset(f"task:{task_id}", "status", "RETRY")
+        pipe.zrem("queue:processing", task_id)
+        self.push_pending(pipe, task_id)
         pipe.execute()
     
     # ============================================================================
@@ -165,10 +425,23 @@ class QueueService:
             task_id: Task identifier
             
         Returns:
-            dict: Task data or None if not found
+            dict: Task data, empty if not found (completed tasks expire
+                after COMPLETED_TASK_TTL)
         """
         return self.redis.hgetall(f"task:{task_id}")
     
+    def get_task_summary(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get only the TASK_SUMMARY_FIELDS of a task (HMGET instead of HGETALL).
+        
+        Args:
+            task_id: Task identifier
+            
+        Returns:
+            dict: Summary fields (missing ones are None) or None if not found
+        """
+        return _task_summary(self.redis.hmget(f"task:{task_id}", TASK_SUMMARY_FIELDS))
+    
     def get_next_pending_task(self) -> Optional[str]:
         """
         Get next pending task ID from queue.
@@ -176,45 +449,50 @@ class QueueService:
         Returns:
             str: Task ID or None if queue is empty
         """
-        return self.redis.rpop("queue:pending")
+        return self._pop_pending_script(keys=PENDING_KEYS[:2])
         
-    def list_tasks(self, limit: int = 20, status: Optional[str] = None) -> Dict[str, Any]:
+    def get_pending_position(self, task_id: str) -> Optional[int]:
         """
-        List tasks from queues.
-        Note: Redis is not optimized for pagination on lists/sets combined with hash lookups.
-        This is a simplified implementation for the admin dashboard.
+        Get a pending task's 1-based position in the queue.
+        
+        Returns:
+            int: Position (1 = next to be picked) or None if not pending
+        """
+        rank = self.redis.zrank("queue:pending:idx", task_id)
+        return None if rank is None else rank + 1
+        
+    def list_tasks(
+        self,
+        limit: int = 20,
+        status: Optional[str] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        List tasks for the admin dashboard, one page at a time.
         
         Args:
             limit: Max number of tasks to return
-            status: Filter by status (pending, processing, failed, completed)
+            status: Filter by status (pending, processing, failed); None lists
+                all tasks, newest first, from ALL_TASKS_KEY
+            offset: Number of tasks to skip
             
         Returns:
             dict: {"items": [], "total": 0}
         """
-        task_ids = []
+        start, stop = offset, offset + limit - 1
         
-        if status == "pending":
-            task_ids = self.redis.lrange("queue:pending", 0, limit - 1)
-        elif status == "processing":
-            task_ids = self.redis.zrange("queue:processing", 0, limit - 1)
-        elif status == "failed":
-            task_ids = self.redis.zrange("queue:failed", 0, limit - 1)
-        else:
-            # If no status, just get recent ones from all (simplified)
-            # In a real app, we might want a separate sorted set for "all tasks by time"
-            # For now, let's prioritize failed -> processing -> pending
-            failed = self.redis.zrange("queue:failed", 0, limit - 1)
-            processing = self.redis.zrange("queue:processing", 0, limit - 1)
-            pending = self.redis.lrange("queue:pending", 0, limit - 1)
-            task_ids = (failed + processing + pending)[:limit]
-            
-        items = []
+        # Page of ids and the queue's size in one round trip
+        pipe = self.redis.pipeline(transaction=False)
+        _queue_task_page(pipe, status, start, stop)
+        task_ids, total = pipe.execute()
+        
+        # One round trip for all tasks, fetching only the summary fields
+        pipe = self.redis.pipeline(transaction=False)
         for tid in task_ids:
-            data = self.redis.hgetall(f"task:{tid}")
-            if data:
-                items.append(data)
+            pipe.hmget(f"task:{tid}", TASK_SUMMARY_FIELDS)
+        items = [summary for summary in map(_task_summary, pipe.execute()) if summary]
                 
-        return {"items": items, "total": len(items)} # Total is approximate/limited here
+        return {"items": items, "total": total}
     
     # ============================================================================
     # QUEUE MANAGEMENT
@@ -227,23 +505,78 @@ class QueueService:
         Args:
             task_id: Task identifier
         """
-        pipe = self.redis.pipeline(transaction=True)
-        pipe.zrem("queue:failed", task_id)
-        pipe.lpush("queue:pending", task_id)
+        # Same ordering as retry_task: status first, push last
+        pipe = self.redis.pipeline(transaction=False)
         pipe.hset(f"task:{task_id}", "status", "PENDING")
+        pipe.zrem("queue:failed", task_id)
+        self.push_pending(pipe, task_id)
         pipe.execute()
     
     def requeue_all_failed(self) -> int:
         """
-        Requeue all failed tasks.
+        Requeue all failed tasks, REQUEUE_BATCH_SIZE per script call.
         
         Returns:
             int: Number of tasks requeued
         """
-        failed = self.redis.zrange("queue:failed", 0, -1)
-        for task_id in failed:
-            self.requeue_task(task_id)
-        return len(failed)
+        total = 0
+        while True:
+            moved = self._requeue_failed_script(
+                keys=["queue:failed", *PENDING_KEYS], args=[REQUEUE_BATCH_SIZE]
+            )
+            total += moved
+            if moved < REQUEUE_BATCH_SIZE:
+                return total
+    
+    def reap_timed_out(self, max_retries: int) -> Tuple[int, int]:
+        """
+        Recover tasks stuck in processing longer than TASK_TIMEOUT (worker died).
+        Runs REAP_TIMED_OUT_LUA in REQUEUE_BATCH_SIZE batches; each batch is atomic.
+        
+        Args:
+            max_retries: Rescues allowed per task before it is failed instead
+            
+        Returns:
+            tuple: (requeued count, failed count)
+        """
+        cutoff = time.time() - TASK_TIMEOUT
+        traceback = f"Zombie task – worker died, max retries ({max_retries}) exceeded"
+        requeued = failed = 0
+        while True:
+            batch_requeued, batch_failed, reaped = self._reap_script(
+                keys=["queue:processing", "queue:failed", *PENDING_KEYS],
+                args=[cutoff, max_retries, time.time(), traceback, REQUEUE_BATCH_SIZE],
+            )
+            requeued += batch_requeued
+            failed += batch_failed
+            if reaped < REQUEUE_BATCH_SIZE:
+                return requeued, failed
+    
+    def recover_handoffs(
+        self,
+        stale: Dict[str, List[str]]
+    ) -> Tuple[int, Dict[str, List[str]]]:
+        """
+        Return tasks stranded in worker handoff lists (queue:processing:{worker_id})
+        to pending. A task is only stranded if it is still there a whole sweep later;
+        anything seen for the first time may be mid-claim and is just remembered.
+        
+        Args:
+            stale: Handoff contents seen by the previous sweep ({list key: task ids})
+            
+        Returns:
+            tuple: (tasks returned to pending, handoff contents seen by this sweep)
+        """
+        returned = 0
+        for key, task_ids in stale.items():
+            returned += self._return_handoff_script(keys=[key, "queue:pending"], args=task_ids)
+        
+        seen = {}
+        for key in self.redis.scan_iter(HANDOFF_PATTERN):
+            task_ids = self.redis.lrange(key, 0, -1)
+            if task_ids:
+                seen[key] = task_ids
+        return returned, seen
     
     # ============================================================================
     # STATISTICS
@@ -256,10 +589,15 @@ class QueueService:
         Returns:
             dict: Queue statistics (pending, processing, failed counts)
         """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.llen("queue:pending")
+        pipe.zcard("queue:processing")
+        pipe.zcard("queue:failed")
+        pending, processing, failed = pipe.execute()
         return {
-            "pending": self.redis.llen("queue:pending"),
-            "processing": self.redis.zcard("queue:processing"),
-            "failed": self.redis.zcard("queue:failed")
+            "pending": pending,
+            "processing": processing,
+            "failed": failed
         }
 
 
@@ -297,6 +635,11 @@ def enqueue_task(*args, **kwargs):
     return get_queue_service().enqueue_task(*args, **kwargs)
 
 
+def claim_next_task(worker_id: str):
+    """Backward compatibility wrapper."""
+    return get_queue_service().claim_next_task(worker_id)
+
+
 def start_processing(*args, **kwargs):
     """Backward compatibility wrapper."""
     return get_queue_service().start_processing(*args, **kwargs)
@@ -324,4 +667,124 @@ def requeue_task(task_id: str):
 
 def requeue_all_failed():
     """Backward compatibility wrapper."""
-    return get_queue_service().requeue_all_failed()
\ No newline at end of file
+    return get_queue_service().requeue_all_failed()
+
+
+# ============================================================================
+# ASYNC ROUTE HELPERS (redis.asyncio client)
+# ============================================================================
+
+_async_enqueue_script = async_redis_client.register_script(ENQUEUE_TASK_LUA)
+task_eta_script = async_redis_client.register_script(TASK_ETA_LUA)
+_async_claim_script = async_redis_client.register_script(CLAIM_TASK_LUA)
+_async_return_handoff_script = async_redis_client.register_script(RETURN_HANDOFF_LUA)
+_async_dispatch_script = async_redis_client.register_script(DISPATCH_TASK_LUA)
+_async_fail_script = async_redis_client.register_script(FAIL_TASK_LUA)
+_async_push_pending_script = async_redis_client.register_script(PUSH_PENDING_LUA)
+_async_requeue_failed_script = async_redis_client.register_script(REQUEUE_FAILED_LUA)
+
+
+async def enqueue_task_async(
+    task_id: str,
+    payload: dict,
+    email_notify: Optional[str] = None,
+    eta: Optional[int] = None,
+    expires: Optional[datetime.datetime] = None
+) -> Dict[str, Any]:
+    """Async counterpart of QueueService.enqueue_task for async routes."""
+    task_data, script_call = _new_task(task_id, payload, email_notify, eta, expires)
+    task_data["queue_position"] = await _async_enqueue_script(**script_call)
+    return task_data
+
+
+async def claim_next_task_async(worker_id: str, timeout: int) -> Optional[Dict[str, Any]]:
+    """
+    Claim the next pending task for a worker, blocking up to `timeout` seconds if none.
+    
+    A backlogged queue is served by one script call (pop, mark STARTED, return data).
+    Only when it is empty does the worker park in BLMOVE, which hands the task off
+    atomically into `queue:processing:{worker_id}`; the claim script then moves it
+    to the processing zset (which the janitor watches) and returns its data.
+    
+    Args:
+        worker_id: Worker identifier
+        timeout: Seconds to block when the queue is empty
+        
+    Returns:
+        dict: Task data, or None if no task arrived (or it was deleted meanwhile)
+    """
+    flat = await _async_dispatch_script(
+        keys=PENDING_KEYS[:2] + ["queue:processing"],
+        args=[*_now(), worker_id],
+    )
+    if flat is not None:
+        return dict(zip(flat[::2], flat[1::2])) or None
+    
+    handoff = f"queue:processing:{worker_id}"
+    task_id = await async_blocking_client.blmove(
+        "queue:pending", handoff, timeout, src="RIGHT", dest="LEFT"
+    )
+    if task_id is None:
+        return None
+    
+    try:
+        flat = await _async_claim_script(
+            keys=[handoff, "queue:pending:idx", "queue:processing", f"task:{task_id}"],
+            # Fresh clock read: the task arrived after the BLMOVE wait
+            args=[task_id, *_now(), worker_id],
+        )
+    except BaseException:
+        # Claim failed or was cancelled after BLMOVE: hand the task back rather than
+        # strand it (a no-op if the claim did run); the janitor sweeps what this misses
+        await asyncio.shield(_async_return_handoff_script(keys=[handoff, "queue:pending"], args=[task_id]))
+        raise
+    return dict(zip(flat[::2], flat[1::2])) or None
+
+
+async def fail_task_async(task_id: str, traceback: str) -> Optional[int]:
+    """Async counterpart of QueueService.fail_task for async routes."""
+    return await _async_fail_script(
+        keys=["queue:processing", "queue:failed", f"task:{task_id}"],
+        args=[task_id, time.time(), traceback],
+    )
+
+
+async def complete_task_async(task_id: str, result: dict) -> None:
+    """Async counterpart of QueueService.complete_task for async routes."""
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        _queue_complete(pipe, task_id, result)
+        await pipe.execute()
+
+
+async def requeue_task_async(task_id: str) -> None:
+    """Async counterpart of QueueService.requeue_task for async routes."""
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        # Same ordering as requeue_task: status first, push last
+        pipe.hset(f"task:{task_id}", "status", "PENDING")
+        pipe.zrem("queue:failed", task_id)
+        await _async_push_pending_script(keys=PENDING_KEYS, args=[task_id], client=pipe)
+        await pipe.execute()
+
+
+async def requeue_all_failed_async() -> int:
+    """Async counterpart of QueueService.requeue_all_failed for async routes."""
+    total = 0
+    while True:
+        moved = await _async_requeue_failed_script(
+            keys=["queue:failed", *PENDING_KEYS], args=[REQUEUE_BATCH_SIZE]
+        )
+        total += moved
+        if moved < REQUEUE_BATCH_SIZE:
+            return total
+
+
+async def list_tasks_async(limit: int = 20, status: Optional[str] = None, offset: int = 0) -> Dict[str, Any]:
+    """Async counterpart of QueueService.list_tasks for async routes."""
+    async with async_redis_client.pipeline(transaction=False) as pipe:
+        _queue_task_page(pipe, status, offset, offset + limit - 1)
+        task_ids, total = await pipe.execute()
+        
+        for tid in task_ids:
+            pipe.hmget(f"task:{tid}", TASK_SUMMARY_FIELDS)
+        items = [summary for summary in map(_task_summary, await pipe.execute()) if summary]
+    return {"items": items, "total": total}
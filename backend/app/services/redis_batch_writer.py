@@ -0,0 +1,149 @@
+# app/services/redis_batch_writer.py
+"""
+RedisBatchWriter - Fire-and-forget hash field writes, flushed in pipelines.
+Used for high-frequency, loss-tolerant updates (worker heartbeats, task status)
+so each request doesn't pay its own Redis round trip.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from app.core.redis_client import async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# KEYS: hashes to update; ARGV: field, value for each key (ARGV[2i-1], ARGV[2i])
+# A write lands only if its hash still exists, so a late flush can't resurrect a
+# revoked worker or an expired task, and a queued status never overwrites a
+# finished task's SUCCESS/FAILURE.
+BATCH_HSET_LUA = """
+local final = {SUCCESS = true, FAILURE = true}
+for i, key in ipairs(KEYS) do
+    local field, value = ARGV[2 * i - 1], ARGV[2 * i]
+    if redis.call('EXISTS', key) == 1 then
+        if field ~= 'status' or not final[redis.call('HGET', key, 'status')] then
+            redis.call('HSET', key, field, value)
+        end
+    end
+end
+"""
+
+
+class RedisBatchWriter:
+    """
+    Background writer that coalesces HSETs and flushes them in one pipeline
+    every `max_delay` seconds or `max_batch` writes, whichever comes first.
+    """
+
+    def __init__(self, client: Redis, max_batch: int = 256, max_delay: float = 0.05):
+        """
+        Initialize RedisBatchWriter.
+
+        Args:
+            client: Async Redis client used for flushing
+            max_batch: Max writes per pipeline
+            max_delay: Max seconds a write waits before being flushed
+        """
+        self.client = client
+        self._hset_script = client.register_script(BATCH_HSET_LUA)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    # ============================================================================
+    # WRITES
+    # ============================================================================
+
+    def hset(self, name: str, key: str, value: Any) -> None:
+        """
+        Queue an HSET; returns immediately. Starts the writer on first use.
+        Dropped at flush time if the hash no longer exists (see BATCH_HSET_LUA).
+
+        Args:
+            name: Hash key
+            key: Field name
+            value: Field value
+        """
+        if self._task is None or self._task.done():
+            self.start()
+        self._queue.put_nowait((name, key, value))
+
+    # ============================================================================
+    # LIFECYCLE
+    # ============================================================================
+
+    def start(self) -> None:
+        """Start the background flush loop on the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out anything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._flush(self._drain_nowait({}))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # Coalesce by (hash, field): only the latest value of each needs writing
+            batch: Dict[Tuple[str, str], Any] = {}
+            name, key, value = await self._queue.get()
+            batch[(name, key)] = value
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    name, key, value = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch[(name, key)] = value
+            await self._flush(batch)
+
+    def _drain_nowait(self, batch: Dict[Tuple[str, str], Any]) -> Dict[Tuple[str, str], Any]:
+        while not self._queue.empty():
+            name, key, value = self._queue.get_nowait()
+            batch[(name, key)] = value
+        return batch
+
+    async def _flush(self, batch: Dict[Tuple[str, str], Any]) -> None:
+        if not batch:
+            return
+        try:
+            # One script call per batch: each write is checked against its hash atomically
+            await self._hset_script(
+                keys=[name for name, _ in batch],
+                args=[item for (_, key), value in batch.items() for item in (key, value)],
+            )
+        except Exception as e:
+            # Fire-and-forget: callers already returned; log and drop
+            logger.error(f"Batch write of {len(batch)} fields failed: {e}")
+
+
+# ============================================================================
+# DEPENDENCY INJECTION
+# ============================================================================
+
+_batch_writer: Optional[RedisBatchWriter] = None
+
+
+def get_batch_writer() -> RedisBatchWriter:
+    """
+    Get singleton RedisBatchWriter instance.
+
+    Returns:
+        RedisBatchWriter: Singleton writer
+    """
+    global _batch_writer
+    if _batch_writer is None:
+        _batch_writer = RedisBatchWriter(async_redis_client)
+    return _batch_writer
@@ -4,9 +4,10 @@ RedisService - Centralized Redis operations with proper encapsulation.
 Provides a clean interface for all Redis operations used throughout the application.
 """
 import logging
-from typing import Any, Optional
+from typing import Any, Iterator, List, Optional, Sequence
 from redis import Redis
 from redis.client import Pipeline
+from redis.commands.core import Script
 from app.core.redis_client import redis_client, get_redis
 
 logger = logging.getLogger(__name__)
@@ -71,6 +72,10 @@ class RedisService:
         """Check if key exists."""
         return self.client.exists(key) > 0
     
+    def scan_iter(self, match: str, count: int = 500) -> Iterator[str]:
+        """Iterate over keys matching a pattern (SCAN, never KEYS)."""
+        return self.client.scan_iter(match=match, count=count)
+    
     # ============================================================================
     # HASH OPERATIONS
     # ============================================================================
@@ -83,6 +88,10 @@ class RedisService:
         """Get all hash fields and values."""
         return self.client.hgetall(name)
     
+    def hmget(self, name: str, keys: Sequence[str]) -> List[Optional[str]]:
+        """Get several hash field values (None for missing fields)."""
+        return self.client.hmget(name, keys)
+    
     def hset(self, name: str, key: str = None, value: Any = None, mapping: dict = None) -> int:
         """
         Set hash field(s).
@@ -175,6 +184,10 @@ class RedisService:
         """Get the number of members in sorted set."""
         return self.client.zcard(name)
     
+    def zrank(self, name: str, value: Any) -> Optional[int]:
+        """Get 0-based rank of member in sorted set, or None if absent."""
+        return self.client.zrank(name, value)
+    
     # ============================================================================
     # PIPELINE
     # ============================================================================
@@ -187,6 +200,19 @@ class RedisService:
             transaction: Whether to use MULTI/EXEC transaction
         """
         return self.client.pipeline(transaction=transaction)
+    
+    # ============================================================================
+    # SCRIPTING
+    # ============================================================================
+    
+    def register_script(self, script: str) -> Script:
+        """
+        Register a Lua script for repeated execution.
+        
+        Args:
+            script: Lua source; calls use EVALSHA and fall back to EVAL
+        """
+        return self.client.register_script(script)
 
 
 # Singleton instance
@@ -0,0 +1,130 @@
+# app/services/verify_cache.py
+"""
+Short-lived in-process cache of verified tokens.
+Lets hot endpoints skip JWT signature checks and Redis lookups when the
+same token is re-presented within a few seconds.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+import jwt
+
+from app.core.security import token_cache_key
+
+
+class VerifyCache:
+    """
+    Bounded TTL cache keyed by a digest of the raw token.
+    Entries expire after `ttl` seconds or at the token's own `exp`, whichever is first.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 5.0):
+        """
+        Initialize VerifyCache.
+
+        Args:
+            maxsize: Maximum number of cached tokens
+            ttl: Maximum seconds an entry is trusted
+        """
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    key = staticmethod(token_cache_key)
+
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Get cached value for a token.
+
+        Args:
+            token: Raw token
+
+        Returns:
+            Cached value or None if missing/expired
+        """
+        h = self.key(token)
+        with self._lock:
+            entry = self._cache.get(h)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._cache.pop(h, None)
+                return None
+            return value
+
+    def set(self, token: str, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Cache a value for a token.
+
+        Args:
+            token: Raw token
+            value: Value to cache (e.g. the authenticated user)
+            expires_at: Token `exp` as a UNIX timestamp, if any
+        """
+        with self._lock:
+            self._cache[self.key(token)] = (value, expires_at)
+
+    def pop(self, token: str) -> None:
+        """
+        Drop a token from the cache (e.g. on logout).
+
+        Args:
+            token: Raw token
+        """
+        with self._lock:
+            self._cache.pop(self.key(token), None)
+
+    def evict_where(self, predicate: Callable[[Any], bool]) -> None:
+        """
+        Drop every entry whose cached value matches (e.g. all tokens of a revoked worker).
+
+        Args:
+            predicate: Called with each cached value
+        """
+        with self._lock:
+            for h in [h for h, (value, _) in self._cache.items() if predicate(value)]:
+                self._cache.pop(h, None)
+
+
+# Verified admin access tokens -> AdminUser
+admin_token_cache = VerifyCache()
+
+# Verified worker tokens -> (worker_id, worker_name). Worker tokens never expire,
+# so the TTL bounds how long a revoked worker stays accepted by other processes.
+worker_token_cache = VerifyCache(maxsize=4096, ttl=30)
+
+# Signature-verified JWT claims -> (secret, claims). Lets the rate limiter and the
+# auth dependency share one decode per token; revocation checks stay with callers.
+claims_cache = VerifyCache(maxsize=10_000, ttl=30)
+
+
+def get_verified_claims(
+    token: str,
+    secret: str,
+    algorithms: List[str],
+    verify_exp: bool = True
+) -> Dict[str, Any]:
+    """
+    Decode and verify a JWT, reusing the result for repeat calls within the cache TTL.
+    
+    Args:
+        token: Raw JWT
+        secret: Signing secret the token must verify against
+        algorithms: Accepted algorithms
+        verify_exp: Whether to enforce the `exp` claim
+        
+    Returns:
+        dict: Token claims
+        
+    Raises:
+        JWTError: If the token is invalid (failures are not cached)
+    """
+    cached = claims_cache.get(token)
+    if cached is not None and cached[0] == secret:
+        return cached[1]
+    
+    claims = jwt.decode(token, secret, algorithms=algorithms, options={"verify_exp": verify_exp})
+    claims_cache.set(token, (secret, claims), expires_at=claims.get("exp"))
+    return claims
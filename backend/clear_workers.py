@@ -3,6 +3,18 @@ import asyncio
 from app.core.redis_client import get_redis
 from app.core.config import get_settings
 
+BATCH_SIZE = 500
+
+
+def unlink_workers(r, keys):
+    """UNLINK worker hashes (freed in the background) and drop their ids, in one pipeline."""
+    pipe = r.pipeline(transaction=False)
+    pipe.unlink(*keys)
+    pipe.srem("workers:ids", *(key.split(":", 1)[1] for key in keys))
+    pipe.execute()
+    return len(keys)
+
+
 async def clear_test_workers():
     print("Connecting to Redis...")
     # get_redis returns the client directly, not a generator
@@ -14,14 +26,25 @@ async def clear_test_workers():
     # Note: The keys in Redis are likely "worker:<uuid>", but the *name* inside the hash is "test-worker-...".
     # The API lists all "worker:*".
     
-    # Let's find all workers and check their names
-    for key in r.scan_iter("worker:*"):
-        data = r.hgetall(key)
-        name = data.get("name", "")
-        if "test-worker" in name:
-            print(f"Deleting worker: {name} (Key: {key})")
-            r.delete(key)
-            count += 1
+    # Let's find all workers and check their names: one pipelined HGET name
+    # per SCAN page, and matches deleted with UNLINK in pipelined batches
+    to_delete = []
+    cursor = 0
+    while True:
+        cursor, keys = r.scan(cursor, match="worker:*", count=BATCH_SIZE)
+        if keys:
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                pipe.hget(key, "name")
+            for key, name in zip(keys, pipe.execute()):
+                if "test-worker" in (name or ""):
+                    print(f"Deleting worker: {name} (Key: {key})")
+                    to_delete.append(key)
+        if len(to_delete) >= BATCH_SIZE or (cursor == 0 and to_delete):
+            count += unlink_workers(r, to_delete)
+            to_delete = []
+        if cursor == 0:
+            break
             
     print(f"Cleared {count} test workers.")
 
@@ -1,36 +1,29 @@
 # janitor/janitor.py
 import time
-from app.services.queue_service import move_to_failed, TASK_TIMEOUT
-from app.core.redis_client import get_redis
+from app.services.queue_service import get_queue_service
 from app.core.config import get_settings
 
 settings = get_settings()
-r = get_redis()
 
 def janitor_loop():
     print(f"Janitor started – Zombie task hunter (max retries: {settings.MAX_TASK_RETRIES})")
+    # Handoff-list contents seen last pass; still there this pass means stranded
+    handoffs = {}
     while True:
         try:
-            now = time.time()
-            stuck_tasks = r.zrangebyscore("queue:processing", 0, now - TASK_TIMEOUT)
-            for task_id in stuck_tasks:
-                retry_count = int(r.hget(f"task:{task_id}", "retry_count") or 0)
-                if retry_count >= settings.MAX_TASK_RETRIES:
-                    move_to_failed(task_id, f"Zombie task – worker died, max retries ({settings.MAX_TASK_RETRIES}) exceeded")
-                    print(f"Failed zombie task {task_id} after {retry_count} retries")
-                else:
-                    # Requeue to pending
-                    pipe = r.pipeline(transaction=True)
-                    pipe.zrem("queue:processing", task_id)
-                    pipe.lpush("queue:pending", task_id)
-                    pipe.hincrby(f"task:{task_id}", "retry_count", 1)
-                    pipe.hset(f"task:{task_id}", "status", "PENDING")
-                    pipe.execute()
-                    print(f"Rescued zombie task {task_id} (retry {retry_count + 1}/{settings.MAX_TASK_RETRIES})")
+            returned, handoffs = get_queue_service().recover_handoffs(handoffs)
+            if returned:
+                print(f"Returned {returned} stranded handoff task(s) to pending")
+            # Stale ids are selected and moved server-side, one atomic script call per batch
+            requeued, failed = get_queue_service().reap_timed_out(settings.MAX_TASK_RETRIES)
+            if requeued:
+                print(f"Rescued {requeued} zombie task(s)")
+            if failed:
+                print(f"Failed {failed} zombie task(s) after {settings.MAX_TASK_RETRIES} retries")
             time.sleep(30)
         except Exception as e:
             print(f"Janitor error: {e}")
             time.sleep(60)
 
 if __name__ == "__main__":
-    janitor_loop()
\ No newline at end of file
+    janitor_loop()
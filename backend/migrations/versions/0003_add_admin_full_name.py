@@ -0,0 +1,23 @@
+"""Add full_name to admins
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 10:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('admins', sa.Column('full_name', sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('admins', 'full_name')
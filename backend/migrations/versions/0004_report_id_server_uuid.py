@@ -0,0 +1,35 @@
+"""Generate report ids in Postgres
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15 11:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in from PostgreSQL 13 (pgcrypto before that)
+    op.alter_column(
+        'reports', 'id',
+        type_=postgresql.UUID(as_uuid=True),
+        postgresql_using='id::uuid',
+        server_default=sa.text('gen_random_uuid()'),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'reports', 'id',
+        type_=sa.String(36),
+        postgresql_using='id::text',
+        server_default=None,
+    )
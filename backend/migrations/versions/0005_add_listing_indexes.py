@@ -0,0 +1,26 @@
+"""Add indexes backing the report listings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15 12:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_phone_reports_status_created', 'phone_reports', ['status', 'created_at'])
+    op.create_index('ix_phone_reports_created', 'phone_reports', ['created_at'])
+    op.create_index('ix_reports_status_created', 'reports', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reports_status_created', table_name='reports')
+    op.drop_index('ix_phone_reports_created', table_name='phone_reports')
+    op.drop_index('ix_phone_reports_status_created', table_name='phone_reports')
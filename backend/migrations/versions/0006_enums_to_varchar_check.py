@@ -0,0 +1,47 @@
+"""Store report enums as VARCHAR with CHECK constraints
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15 13:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# (table, column, constraint, PG enum type from 0002 or None, allowed values, length)
+# Values are the enum member names, which is what SQLAlchemy persists.
+ENUM_COLUMNS = [
+    ('phone_reports', 'report_type', 'phone_report_type', None, ['scam', 'spam', 'harassment', 'other'], 20),
+    ('phone_reports', 'status', 'phone_report_status', None, ['pending', 'approved', 'rejected'], 20),
+    ('reports', 'category', 'report_category', 'category_enum', ['Phone_Number', 'Personnel_KOL', 'Company', 'Event'], 16),
+    ('reports', 'status', 'report_status', 'status_enum', ['Draft', 'Publish', 'Blacklist'], 16),
+    ('reports', 'proof_type', 'report_proof_type', 'prooftype_enum', ['image', 'video', 'audio'], 16),
+]
+
+
+def _in_list(column, values):
+    return f"{column} IN ({', '.join(repr(v) for v in values)})"
+
+
+def upgrade() -> None:
+    for table, column, constraint, pg_type, values, length in ENUM_COLUMNS:
+        if pg_type is not None:
+            op.alter_column(table, column, type_=sa.String(length), postgresql_using=f'{column}::text')
+        op.create_check_constraint(constraint, table, _in_list(column, values))
+    for table, column, constraint, pg_type, values, length in ENUM_COLUMNS:
+        if pg_type is not None:
+            op.execute(f'DROP TYPE IF EXISTS {pg_type}')
+
+
+def downgrade() -> None:
+    for table, column, constraint, pg_type, values, length in ENUM_COLUMNS:
+        op.drop_constraint(constraint, table, type_='check')
+        if pg_type is not None:
+            op.execute(f"CREATE TYPE {pg_type} AS ENUM ({', '.join(repr(v) for v in values)})")
+            op.alter_column(table, column, type_=sa.Enum(*values, name=pg_type), postgresql_using=f'{column}::{pg_type}')
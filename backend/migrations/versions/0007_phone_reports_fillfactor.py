@@ -0,0 +1,25 @@
+"""Leave free space in phone_reports pages for in-place updates
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15 14:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Re-reports only touch count/updated_at (unindexed), so with free space on
+    # the page Postgres can rewrite the row as a HOT update without index churn.
+    # Applies to newly written pages; existing ones are repacked only by VACUUM FULL/CLUSTER.
+    op.execute('ALTER TABLE phone_reports SET (fillfactor = 80)')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE phone_reports RESET (fillfactor)')
@@ -0,0 +1,29 @@
+"""Extend phone_reports listing indexes with id for keyset pagination
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15 15:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # (created_at, id) row comparisons need id in the index to stay a range scan
+    op.drop_index('ix_phone_reports_status_created', table_name='phone_reports')
+    op.drop_index('ix_phone_reports_created', table_name='phone_reports')
+    op.create_index('ix_phone_reports_status_created', 'phone_reports', ['status', 'created_at', 'id'])
+    op.create_index('ix_phone_reports_created', 'phone_reports', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_phone_reports_created', table_name='phone_reports')
+    op.drop_index('ix_phone_reports_status_created', table_name='phone_reports')
+    op.create_index('ix_phone_reports_status_created', 'phone_reports', ['status', 'created_at'])
+    op.create_index('ix_phone_reports_created', 'phone_reports', ['created_at'])
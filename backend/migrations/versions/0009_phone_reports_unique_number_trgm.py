@@ -0,0 +1,34 @@
+"""Make phone_reports.phone_number unique and index it for substring search
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15 16:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # create_report already keeps one row per number; the unique index enforces it
+    # (and lets create_report upsert on it). Duplicates left by concurrent reports
+    # must be merged before this runs.
+    op.drop_index('ix_phone_reports_phone_number', table_name='phone_reports')
+    op.create_index('ix_phone_reports_phone_number', 'phone_reports', ['phone_number'], unique=True)
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_phone_reports_phone_trgm', 'phone_reports', ['phone_number'],
+        postgresql_using='gin', postgresql_ops={'phone_number': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_phone_reports_phone_trgm', table_name='phone_reports')
+    op.drop_index('ix_phone_reports_phone_number', table_name='phone_reports')
+    op.create_index('ix_phone_reports_phone_number', 'phone_reports', ['phone_number'])
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+One-off: index workers registered before the `workers:ids` set existed.
+
+Usage:
+    python scripts/backfill_worker_index.py
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.redis_client import get_redis
+
+
+def backfill_worker_index():
+    """Add every existing worker:{id} hash to the workers:ids set."""
+    r = get_redis()
+    worker_ids = [key.split(":", 1)[1] for key in r.scan_iter(match="worker:*", count=500, _type="hash")]
+    if worker_ids:
+        r.sadd("workers:ids", *worker_ids)
+    print(f"Indexed {len(worker_ids)} workers.")
+
+
+if __name__ == "__main__":
+    backfill_worker_index()
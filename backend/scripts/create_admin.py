@@ -5,27 +5,70 @@ This should be run by system administrators only, NOT exposed as a public API.
 
 Usage:
     python scripts/create_admin.py
+    echo "$PASSWORD" | python scripts/create_admin.py --username alice --email a@x.io --password-stdin
+    python scripts/create_admin.py --bulk-csv admins.csv   # username,email,password[,is_superuser]
 
 Security:
-    - Interactive password entry (not logged)
+    - Interactive or stdin password entry (not logged, never on the command line)
     - Stored in PostgreSQL (persistent)
     - No public API exposure
 """
 import sys
 import os
+import csv
 import getpass
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from sqlalchemy.orm import Session
-from app.core.postgres_client import SessionLocal
+from app.core.postgres_client import SessionLocal, engine
 from app.models.admin import Admin
 from app.services.auth_service import get_password_hash
 
 
+# Rows are staged in memory up to this size before spilling to a temp file
+COPY_SPOOL_BYTES = 8 * 1024 * 1024
+COPY_ADMINS_SQL = (
+    "COPY admins (username, email, hashed_password, is_superuser, is_active) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+def validate_username(username: str) -> Optional[str]:
+    """Return an error message, or None if the username is acceptable."""
+    if not username:
+        return "Username cannot be empty"
+    if len(username) < 3:
+        return "Username must be at least 3 characters"
+    return None
+
+
+def validate_email(email: str) -> Optional[str]:
+    """Return an error message, or None if the email is acceptable."""
+    if not email:
+        return "Email cannot be empty"
+    if "@" not in email:
+        return "Invalid email format"
+    return None
+
+
+def validate_password(password: str) -> Optional[str]:
+    """Return an error message, or None if the password is acceptable."""
+    if not password:
+        return "Password cannot be empty"
+    # argon2id has no input length cap (bcrypt's 72-byte limit no longer applies)
+    if len(password.encode('utf-8')) < 8:
+        return "Password must be at least 8 bytes"
+    return None
+
+
 def create_admin():
     """Interactively create an admin user."""
     print("=" * 60)
@@ -36,40 +79,27 @@ def create_admin():
     # Get username
     while True:
         username = input("Enter username: ").strip()
-        if not username:
-            print("❌ Username cannot be empty")
-            continue
-        if len(username) < 3:
-            print("❌ Username must be at least 3 characters")
+        error = validate_username(username)
+        if error:
+            print(f"❌ {error}")
             continue
         break
     
     # Get email
     while True:
         email = input("Enter email: ").strip()
-        if not email:
-            print("❌ Email cannot be empty")
-            continue
-        if "@" not in email:
-            print("❌ Invalid email format")
+        error = validate_email(email)
+        if error:
+            print(f"❌ {error}")
             continue
         break
     
     # Get password
     while True:
         password = getpass.getpass("Enter password: ")
-        if not password:
-            print("❌ Password cannot be empty")
-            continue
-        
-        # Check byte length (bcrypt limit is 72 BYTES, not characters!)
-        password_bytes = len(password.encode('utf-8'))
-        if password_bytes < 8:
-            print("❌ Password must be at least 8 bytes")
-            continue
-        if password_bytes > 72:
-            print(f"❌ Password is {password_bytes} bytes, max is 72 bytes (bcrypt limit)")
-            print("   Hint: Use shorter password or avoid special Unicode characters")
+        error = validate_password(password)
+        if error:
+            print(f"❌ {error}")
             continue
         
         password_confirm = getpass.getpass("Confirm password: ")
@@ -84,6 +114,11 @@ def create_admin():
     is_superuser_input = input("Is superuser? (y/N): ").strip().lower()
     is_superuser = is_superuser_input in ["y", "yes"]
     
+    return insert_admin(username, email, password, is_superuser)
+
+
+def insert_admin(username: str, email: str, password: str, is_superuser: bool) -> bool:
+    """Create one admin user (already validated) and print the outcome."""
     print()
     print("Creating admin user...")
     
@@ -116,7 +151,6 @@ def create_admin():
         
         db.add(admin)
         db.commit()
-        db.refresh(admin)
         
         print()
         print("✅ Admin user created successfully!")
@@ -136,9 +170,87 @@ def create_admin():
         db.close()
 
 
+def create_admin_from_args(args: argparse.Namespace) -> bool:
+    """Non-interactive create: --username/--email, password read from stdin."""
+    if not args.password_stdin:
+        print("❌ --password-stdin is required with --username/--email")
+        return False
+    password = sys.stdin.readline().rstrip("\r\n")
+    for error in (validate_username(args.username), validate_email(args.email), validate_password(password)):
+        if error:
+            print(f"❌ {error}")
+            return False
+    return insert_admin(args.username, args.email, password, args.superuser)
+
+
+def bulk_create_admins(csv_path: str) -> bool:
+    """
+    Create admins from a CSV of username,email,password[,is_superuser] rows
+    with a single COPY. Passwords are hashed in parallel across processes;
+    any invalid or duplicate row aborts the whole load.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = [row for row in csv.reader(f) if row]
+    if rows and rows[0][:3] == ["username", "email", "password"]:
+        rows = rows[1:]
+    
+    for line, row in enumerate(rows, start=1):
+        if len(row) not in (3, 4):
+            print(f"❌ Row {line}: expected username,email,password[,is_superuser]")
+            return False
+        error = validate_username(row[0].strip()) or validate_email(row[1].strip()) or validate_password(row[2])
+        if error:
+            print(f"❌ Row {line}: {error}")
+            return False
+    
+    print(f"Hashing {len(rows)} passwords...")
+    # argon2 hashing is CPU-bound; spread it over all cores
+    with ProcessPoolExecutor() as pool:
+        hashes = list(pool.map(get_password_hash, [row[2] for row in rows], chunksize=16))
+    
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES, mode="w+", newline="") as spool:
+        writer = csv.writer(spool)
+        for row, hashed_password in zip(rows, hashes):
+            is_superuser = len(row) == 4 and row[3].strip().lower() in ("y", "yes", "true", "1")
+            writer.writerow([row[0].strip(), row[1].strip(), hashed_password, is_superuser, True])
+        spool.seek(0)
+        
+        conn = engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(COPY_ADMINS_SQL, spool)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Error loading admins: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    print(f"✅ Created {len(rows)} admin users")
+    return True
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Command line options; with none given the tool runs interactively."""
+    parser = argparse.ArgumentParser(description="Create admin users")
+    parser.add_argument("--username", help="Username (non-interactive mode)")
+    parser.add_argument("--email", help="Email (non-interactive mode)")
+    parser.add_argument("--password-stdin", action="store_true", help="Read the password from the first line of stdin")
+    parser.add_argument("--superuser", action="store_true", help="Create a superuser")
+    parser.add_argument("--bulk-csv", metavar="PATH", help="Bulk-load username,email,password[,is_superuser] rows")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
     try:
-        success = create_admin()
+        args = parse_args()
+        if args.bulk_csv:
+            success = bulk_create_admins(args.bulk_csv)
+        elif args.username or args.email:
+            success = create_admin_from_args(args)
+        else:
+            success = create_admin()
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n❌ Cancelled by user")
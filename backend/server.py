@@ -1,24 +1,23 @@
 # server.py
 import uvicorn
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from jose import jwt, JWTError
 from starlette import status
 import time # Added for request logging timing
 from starlette import status # Added for global exception handler
 
 from app.api.v1 import admin_auth, admin_tasks, client_tasks, client_uploads, admin_workers, admin_phones, client_phone, admin_users
 from app.core.config import get_settings
-from app.core.redis_client import get_redis
+from app.core.redis_client import get_redis, async_redis_client, async_blocking_client
+from app.services.captcha_service import get_captcha_service
+from app.services.redis_batch_writer import get_batch_writer
 from app.core.postgres_client import get_db
 
 # Configure logging
@@ -26,32 +25,31 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
-
-# ============================================================================
-# RATE LIMITING - Redis-backed with custom key functions
-# ============================================================================
-
-# Import key functions from rate_limit module to avoid circular imports
-from app.core.rate_limit import get_admin_user_identifier, get_client_identifier
-
-# Initialize rate limiter with Redis storage for distributed rate limiting
-limiter = Limiter(
-    key_func=get_remote_address,  # Default key function
-    storage_uri=settings.REDIS_URL  # Redis backend for scalability
-)
+IS_PRODUCTION = settings.ENVIRONMENT == "production"  # Checked on every response
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared outbound clients at startup and close them on shutdown."""
+    await get_captcha_service().warm_up()  # Pre-open the pooled Turnstile connection
+    get_batch_writer().start()
+    yield
+    await get_batch_writer().stop()  # Flush pending heartbeat/status writes
+    await get_captcha_service().close()
+    await async_redis_client.aclose()
+    await async_blocking_client.aclose()
 
 app = FastAPI(
     title="Blacklist Distributed Task System",
     version="1.0.0",
     description="A distributed task processing system with queue management",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     docs_url="/api/docs" if settings.DEBUG else None,  # Disable docs in production
     redoc_url="/api/redoc" if settings.DEBUG else None,
     openapi_url="/openapi.json" if settings.DEBUG else None
 )
 
-# Add rate limiter to app state
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Rate limiting is a Redis token bucket applied per route (see app/core/rate_limit.py)
 
 # ============================================================================
 # STATIC FILES & ADMIN DASHBOARD
@@ -92,7 +90,7 @@ if settings.allowed_hosts_list != ["*"]:
     )
 
 # 4. GZip compression for responses
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # 5. Security headers middleware
 @app.middleware("http")
@@ -113,7 +111,7 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
     # Content Security Policy
-    if settings.ENVIRONMENT == "production":
+    if IS_PRODUCTION:
         response.headers["Content-Security-Policy"] = (
             "default-src 'self'; "
             "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
@@ -124,7 +122,7 @@ async def add_security_headers(request: Request, call_next):
         )
 
     # HSTS (HTTP Strict Transport Security) - only in production with HTTPS
-    if settings.ENVIRONMENT == "production":
+    if IS_PRODUCTION:
         response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
 
     # Remove server header
@@ -165,7 +163,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
 
     # Don't expose internal errors in production
-    if settings.ENVIRONMENT == "production":
+    if IS_PRODUCTION:
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "Internal server error"}
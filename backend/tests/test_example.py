@@ -38,6 +38,201 @@ class TestPasswordFunctions:
         assert verify_password("wrong_password", hashed) is False
 
 
+@pytest.mark.unit
+class TestRateLimitParsing:
+    """Test rate limit string parsing for the token bucket"""
+    
+    def test_parse_per_minute(self):
+        """Test that count/period maps to capacity and tokens per second"""
+        from app.core.rate_limit import parse_rate_limit
+        
+        assert parse_rate_limit("120/minute") == (120, 2.0)
+        
+    def test_parse_plural_period(self):
+        """Test that plural period names are accepted"""
+        from app.core.rate_limit import parse_rate_limit
+        
+        assert parse_rate_limit("10/seconds") == (10, 10.0)
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test TOKEN_BUCKET_LUA and the token_bucket dependency (fakeredis with Lua)"""
+
+    @pytest.fixture
+    def bucket(self, monkeypatch):
+        """Point the rate limiter's script at a fake Redis"""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        from app.core import rate_limit
+
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        script = client.register_script(rate_limit.TOKEN_BUCKET_LUA)
+        monkeypatch.setattr(rate_limit, "_token_bucket_script", script)
+        return script
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_capacity(self, bucket):
+        """Test that a full bucket allows `capacity` requests at once, then refuses"""
+        allowed = [await bucket(keys=["bucket"], args=[3, 1.0, 1000]) for _ in range(4)]
+
+        assert allowed == [1, 1, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_refill_by_elapsed_time(self, bucket):
+        """Test that tokens come back at the refill rate, capped at capacity"""
+        for _ in range(2):
+            await bucket(keys=["bucket"], args=[2, 2.0, 1000])
+
+        assert await bucket(keys=["bucket"], args=[2, 2.0, 1100]) == 0
+        assert await bucket(keys=["bucket"], args=[2, 2.0, 1500]) == 1
+        assert await bucket(keys=["bucket"], args=[2, 2.0, 1500]) == 0
+
+        # A long idle period refills to capacity, not beyond
+        allowed = [await bucket(keys=["bucket"], args=[2, 2.0, 60_000]) for _ in range(3)]
+        assert allowed == [1, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_429_with_retry_after(self, bucket):
+        """Test that the dependency raises 429 with Retry-After once the bucket is empty"""
+        from fastapi import HTTPException
+        from starlette.requests import Request
+        from app.core.rate_limit import token_bucket, get_client_identifier
+
+        async def endpoint():
+            pass
+        request = Request({
+            "type": "http", "path": "/check", "headers": [], "client": ("203.0.113.7", 1234), "endpoint": endpoint,
+        })
+        check = token_bucket("2/minute", get_client_identifier)
+
+        await check(request)
+        await check(request)
+        with pytest.raises(HTTPException) as exc:
+            await check(request)
+
+        assert exc.value.status_code == 429
+        assert exc.value.headers == {"Retry-After": "30"}
+
+
+@pytest.mark.unit
+class TestVerifyCache:
+    """Test the verified-token cache"""
+
+    def test_get_and_set(self):
+        """Test that a cached value is returned for the same token only"""
+        from app.services.verify_cache import VerifyCache
+
+        cache = VerifyCache()
+        cache.set("token-a", "alice")
+
+        assert cache.get("token-a") == "alice"
+        assert cache.get("token-b") is None
+
+    def test_exp_cutoff(self):
+        """Test that an entry is dropped once the token's own exp has passed"""
+        import time
+        from app.services.verify_cache import VerifyCache
+
+        cache = VerifyCache(ttl=60)
+        cache.set("expired", "alice", expires_at=time.time() - 1)
+        cache.set("valid", "bob", expires_at=time.time() + 60)
+
+        assert cache.get("expired") is None
+        assert cache.get("valid") == "bob"
+
+    def test_pop(self):
+        """Test that pop drops a token (and tolerates unknown ones)"""
+        from app.services.verify_cache import VerifyCache
+
+        cache = VerifyCache()
+        cache.set("token", "alice")
+        cache.pop("token")
+        cache.pop("unknown")
+
+        assert cache.get("token") is None
+
+    def test_evict_where(self):
+        """Test that evict_where drops only the entries whose value matches"""
+        from app.services.verify_cache import VerifyCache
+
+        cache = VerifyCache()
+        cache.set("w1-a", ("worker-1", "one"))
+        cache.set("w1-b", ("worker-1", "one"))
+        cache.set("w2", ("worker-2", "two"))
+
+        cache.evict_where(lambda value: value[0] == "worker-1")
+
+        assert cache.get("w1-a") is None
+        assert cache.get("w1-b") is None
+        assert cache.get("w2") == ("worker-2", "two")
+
+
+@pytest.mark.unit
+class TestListCursor:
+    """Test the admin phone listing keyset cursor"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes back to the same (created_at, id)"""
+        from datetime import datetime, timedelta, timezone
+        from app.services.phone_service import encode_list_cursor, decode_list_cursor
+
+        created_at = datetime(2025, 3, 1, 12, 30, 45, 123456, tzinfo=timezone(timedelta(hours=7)))
+        cursor = encode_list_cursor(created_at, 42)
+
+        assert "+" not in cursor
+        assert decode_list_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["garbage", "2025-03-01T12:00:00Z,abc", ",5"])
+    def test_malformed_raises(self, cursor):
+        """Test that malformed cursors raise ValueError"""
+        from app.services.phone_service import decode_list_cursor
+
+        with pytest.raises(ValueError):
+            decode_list_cursor(cursor)
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_400(self):
+        """Test that the listing route rejects a bad cursor before touching the database"""
+        from fastapi import HTTPException
+        from app.api.v1.admin_phones import list_phone_reports
+
+        with pytest.raises(HTTPException) as exc:
+            await list_phone_reports(
+                skip=0, limit=20, status=None, phone_number=None, cursor="garbage", admin=None, db=None
+            )
+
+        assert exc.value.status_code == 400
+
+
+@pytest.mark.unit
+class TestLegacyPasswordHashes:
+    """Test argon2id hashing with legacy bcrypt hashes still accepted"""
+
+    def test_bcrypt_hash_verifies(self):
+        """Test that a pre-argon2 bcrypt hash still verifies"""
+        import bcrypt
+
+        hashed = bcrypt.hashpw(b"legacy_password", bcrypt.gensalt(rounds=4)).decode()
+
+        assert verify_password("legacy_password", hashed) is True
+        assert verify_password("wrong_password", hashed) is False
+
+    def test_bcrypt_hash_needs_rehash(self):
+        """Test that bcrypt hashes are flagged for upgrade and argon2id ones are not"""
+        import bcrypt
+        from app.services.auth_service import password_needs_rehash
+
+        legacy = bcrypt.hashpw(b"legacy_password", bcrypt.gensalt(rounds=4)).decode()
+
+        assert password_needs_rehash(legacy) is True
+        assert password_needs_rehash(get_password_hash("new_password")) is False
+
+    def test_new_hashes_are_argon2id(self):
+        """Test that new hashes use argon2id"""
+        assert get_password_hash("new_password").startswith("$argon2id$")
+
+
 # ============================================================================
 # INTEGRATION TESTS - Test component interactions
 # ============================================================================
@@ -157,6 +157,7 @@ def cleanup_redis():
     
     # Clear queues
     r.delete("queue:pending")
+    r.delete("queue:pending:idx")
     r.delete("queue:processing")
     r.delete("queue:failed")
     
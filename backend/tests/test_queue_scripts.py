@@ -0,0 +1,399 @@
+"""
+Queue Lua script tests
+
+Runs QueueService and the async route helpers against fakeredis (with Lua
+support), so no Redis server is needed.
+"""
+
+import time
+import uuid
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from app.services import queue_service as q
+from app.services.redis_service import RedisService
+
+
+def _task_id() -> str:
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def server():
+    """Fresh fake Redis server shared by the sync and async clients of a test"""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis(server):
+    """Sync client on the fake server"""
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+@pytest.fixture
+def queue(redis):
+    """QueueService backed by the fake server"""
+    redis_service = RedisService.__new__(RedisService)
+    redis_service.client = redis
+    return q.QueueService(redis_service)
+
+
+@pytest.fixture
+def async_queue(server, monkeypatch):
+    """Point the module's async helpers at the fake server"""
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(q, "async_redis_client", client)
+    monkeypatch.setattr(q, "async_blocking_client", client)
+    for name, script in [
+        ("_async_enqueue_script", q.ENQUEUE_TASK_LUA),
+        ("_async_claim_script", q.CLAIM_TASK_LUA),
+        ("_async_return_handoff_script", q.RETURN_HANDOFF_LUA),
+        ("_async_dispatch_script", q.DISPATCH_TASK_LUA),
+        ("_async_fail_script", q.FAIL_TASK_LUA),
+        ("_async_push_pending_script", q.PUSH_PENDING_LUA),
+        ("_async_requeue_failed_script", q.REQUEUE_FAILED_LUA),
+    ]:
+        monkeypatch.setattr(q, name, client.register_script(script))
+    return client
+
+
+def assert_index_in_sync(redis):
+    """queue:pending:idx must hold exactly the pending ids, ranked in pop order"""
+    pending = redis.lrange("queue:pending", 0, -1)
+    assert redis.zrange("queue:pending:idx", 0, -1) == pending[::-1]
+
+
+# ============================================================================
+# ENQUEUE / POSITIONS
+# ============================================================================
+
+@pytest.mark.unit
+class TestEnqueue:
+    """Test ENQUEUE_TASK_LUA and the pending index"""
+
+    def test_positions_count_queue_ahead(self, queue, redis):
+        """Test that each task's position counts pending and processing tasks ahead of it"""
+        ids = [_task_id() for _ in range(3)]
+        positions = [queue.enqueue_task(tid, {"n": i})["queue_position"] for i, tid in enumerate(ids)]
+
+        assert positions == [1, 2, 3]
+        assert [queue.get_pending_position(tid) for tid in ids] == [1, 2, 3]
+        assert_index_in_sync(redis)
+
+        queue.claim_next_task("worker")
+        assert queue.enqueue_task(_task_id(), {})["queue_position"] == 4
+
+    def test_task_hash_and_all_tasks(self, queue, redis):
+        """Test that the task hash is written and the task listed in all_tasks"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {"phone": "123"}, email_notify="a@b.c")
+
+        task = redis.hgetall(f"task:{tid}")
+        assert task["status"] == "PENDING"
+        assert task["retries"] == "0"
+        assert task["email_notify"] == "a@b.c"
+        assert redis.zscore(q.ALL_TASKS_KEY, tid) is not None
+
+    def test_eta_script_snapshot(self, queue, redis):
+        """Test TASK_ETA_LUA returns pending rank, pending count and processing count"""
+        ids = [_task_id() for _ in range(3)]
+        for tid in ids:
+            queue.enqueue_task(tid, {})
+        queue.claim_next_task("worker")
+
+        eta = redis.register_script(q.TASK_ETA_LUA)
+        assert eta(keys=q.TASK_ETA_KEYS, args=[ids[2]]) == [1, 2, 1]
+        assert eta(keys=q.TASK_ETA_KEYS, args=[ids[0]]) == [-1, 2, 1]
+
+    def test_pop_pending_keeps_index(self, queue, redis):
+        """Test POP_PENDING_LUA pops FIFO and drops the index entry"""
+        ids = [_task_id() for _ in range(2)]
+        for tid in ids:
+            queue.enqueue_task(tid, {})
+
+        assert queue.get_next_pending_task() == ids[0]
+        assert queue.get_pending_position(ids[0]) is None
+        assert queue.get_pending_position(ids[1]) == 1
+        assert_index_in_sync(redis)
+
+        queue.get_next_pending_task()
+        assert queue.get_next_pending_task() is None
+
+
+# ============================================================================
+# DISPATCH / FAIL / COMPLETE
+# ============================================================================
+
+@pytest.mark.unit
+class TestTaskLifecycle:
+    """Test DISPATCH_TASK_LUA, FAIL_TASK_LUA and complete_task"""
+
+    def test_claim_marks_started(self, queue, redis):
+        """Test that claiming pops FIFO and moves the task to processing"""
+        ids = [_task_id() for _ in range(2)]
+        for tid in ids:
+            queue.enqueue_task(tid, {})
+
+        task = queue.claim_next_task("worker-1")
+
+        assert task["task_id"] == ids[0]
+        assert task["status"] == "STARTED"
+        assert task["worker_id"] == "worker-1"
+        assert redis.zscore("queue:processing", ids[0]) is not None
+        assert_index_in_sync(redis)
+
+    def test_claim_empty_queue(self, queue):
+        """Test that claiming from an empty queue returns None"""
+        assert queue.claim_next_task("worker") is None
+
+    def test_claim_skips_deleted_task(self, queue, redis):
+        """Test that a task whose hash is gone is dropped, not put in processing"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        redis.delete(f"task:{tid}")
+
+        assert queue.claim_next_task("worker") is None
+        assert redis.zcard("queue:processing") == 0
+        assert redis.zcard("queue:pending:idx") == 0
+
+    def test_fail_increments_retries(self, queue, redis):
+        """Test that each failure moves the task to failed and bumps retries"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        queue.claim_next_task("worker")
+
+        assert queue.fail_task(tid, "boom") == 1
+        assert redis.zscore("queue:failed", tid) is not None
+        assert redis.zcard("queue:processing") == 0
+        assert redis.hget(f"task:{tid}", "status") == "FAILURE"
+        assert redis.hget(f"task:{tid}", "traceback") == "boom"
+
+        queue.requeue_task(tid)
+        queue.claim_next_task("worker")
+        assert queue.fail_task(tid, "boom again") == 2
+
+    def test_fail_deleted_task(self, queue, redis):
+        """Test that failing a deleted task returns None and leaves failed alone"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        queue.claim_next_task("worker")
+        redis.delete(f"task:{tid}")
+
+        assert queue.fail_task(tid, "boom") is None
+        assert redis.zcard("queue:failed") == 0
+        assert redis.zcard("queue:processing") == 0
+
+    def test_complete_sets_ttl(self, queue, redis):
+        """Test that completing a task stores the result and expires the hash"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        queue.claim_next_task("worker")
+
+        queue.complete_task(tid, {"ok": True})
+
+        assert redis.hget(f"task:{tid}", "status") == "SUCCESS"
+        assert 0 < redis.ttl(f"task:{tid}") <= q.COMPLETED_TASK_TTL
+        assert redis.zcard("queue:processing") == 0
+        assert redis.zscore(q.ALL_TASKS_KEY, tid) is None
+
+
+# ============================================================================
+# REQUEUE / REAP
+# ============================================================================
+
+@pytest.mark.unit
+class TestRequeue:
+    """Test REQUEUE_FAILED_LUA and requeue_task"""
+
+    def _fail(self, queue, count):
+        ids = [_task_id() for _ in range(count)]
+        for tid in ids:
+            queue.enqueue_task(tid, {})
+        for tid in ids:
+            queue.claim_next_task("worker")
+            queue.fail_task(tid, "boom")
+        return ids
+
+    def test_requeue_task(self, queue, redis):
+        """Test that a failed task goes back to the end of pending"""
+        queued = _task_id()
+        failed, = self._fail(queue, 1)
+        queue.enqueue_task(queued, {})
+
+        queue.requeue_task(failed)
+
+        assert redis.zcard("queue:failed") == 0
+        assert redis.hget(f"task:{failed}", "status") == "PENDING"
+        assert queue.get_pending_position(failed) == 2
+        assert_index_in_sync(redis)
+
+    @pytest.mark.parametrize("count", [0, 1, 2, 3, 4, 5])
+    def test_requeue_all_batches(self, queue, redis, monkeypatch, count):
+        """Test requeue_all_failed across REQUEUE_BATCH_SIZE boundaries"""
+        monkeypatch.setattr(q, "REQUEUE_BATCH_SIZE", 2)
+        ids = self._fail(queue, count)
+
+        assert queue.requeue_all_failed() == count
+        assert redis.zcard("queue:failed") == 0
+        assert sorted(redis.lrange("queue:pending", 0, -1)) == sorted(ids)
+        assert all(redis.hget(f"task:{tid}", "status") == "PENDING" for tid in ids)
+        assert_index_in_sync(redis)
+
+
+@pytest.mark.unit
+class TestReap:
+    """Test REAP_TIMED_OUT_LUA"""
+
+    def _stale(self, queue, redis, count):
+        """Claim `count` tasks and backdate them past TASK_TIMEOUT"""
+        ids = [_task_id() for _ in range(count)]
+        for tid in ids:
+            queue.enqueue_task(tid, {})
+            queue.claim_next_task("worker")
+            redis.zadd("queue:processing", {tid: 0})
+        return ids
+
+    def test_requeues_then_fails(self, queue, redis):
+        """Test that a zombie is requeued until retry_count reaches max retries"""
+        tid, = self._stale(queue, redis, 1)
+
+        assert queue.reap_timed_out(max_retries=1) == (1, 0)
+        assert redis.hget(f"task:{tid}", "status") == "PENDING"
+        assert redis.hget(f"task:{tid}", "retry_count") == "1"
+        assert queue.get_pending_position(tid) == 1
+        assert_index_in_sync(redis)
+
+        queue.claim_next_task("worker")
+        redis.zadd("queue:processing", {tid: 0})
+
+        assert queue.reap_timed_out(max_retries=1) == (0, 1)
+        assert redis.hget(f"task:{tid}", "status") == "FAILURE"
+        assert redis.hget(f"task:{tid}", "retries") == "1"
+        assert redis.zscore("queue:failed", tid) is not None
+        assert redis.zcard("queue:processing") == 0
+
+    def test_leaves_fresh_tasks(self, queue, redis):
+        """Test that tasks started within TASK_TIMEOUT are not reaped"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        queue.claim_next_task("worker")
+
+        assert queue.reap_timed_out(max_retries=1) == (0, 0)
+        assert redis.zscore("queue:processing", tid) is not None
+
+    def test_drops_deleted_tasks(self, queue, redis):
+        """Test that a zombie whose hash is gone is removed without being counted"""
+        tid, = self._stale(queue, redis, 1)
+        redis.delete(f"task:{tid}")
+
+        assert queue.reap_timed_out(max_retries=1) == (0, 0)
+        assert redis.zcard("queue:processing") == 0
+        assert redis.llen("queue:pending") == 0
+
+    @pytest.mark.parametrize("count", [2, 5])
+    def test_batches(self, queue, redis, monkeypatch, count):
+        """Test reaping across REQUEUE_BATCH_SIZE boundaries"""
+        monkeypatch.setattr(q, "REQUEUE_BATCH_SIZE", 2)
+        self._stale(queue, redis, count)
+
+        assert queue.reap_timed_out(max_retries=1) == (count, 0)
+        assert redis.zcard("queue:processing") == 0
+        assert_index_in_sync(redis)
+
+
+# ============================================================================
+# ASYNC CLAIM PATH / HANDOFF RECOVERY
+# ============================================================================
+
+@pytest.mark.unit
+class TestAsyncClaim:
+    """Test claim_next_task_async (dispatch, BLMOVE handoff) and recover_handoffs"""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_backlog(self, async_queue, redis):
+        """Test that a backlogged queue is served by the dispatch script"""
+        tid = _task_id()
+        await q.enqueue_task_async(tid, {})
+
+        task = await q.claim_next_task_async("worker", timeout=1)
+
+        assert task["task_id"] == tid
+        assert task["status"] == "STARTED"
+        assert redis.zscore("queue:processing", tid) is not None
+        assert_index_in_sync(redis)
+
+    @pytest.mark.asyncio
+    async def test_blmove_handoff(self, async_queue, redis, monkeypatch):
+        """Test the BLMOVE path: the task passes through the handoff list into processing"""
+        async def empty_queue(**kwargs):
+            return None
+        monkeypatch.setattr(q, "_async_dispatch_script", empty_queue)
+        tid = _task_id()
+        await q.enqueue_task_async(tid, {})
+
+        task = await q.claim_next_task_async("worker", timeout=1)
+
+        assert task["task_id"] == tid
+        assert task["worker_id"] == "worker"
+        assert redis.llen("queue:processing:worker") == 0
+        assert redis.zscore("queue:processing", tid) is not None
+        assert_index_in_sync(redis)
+
+    @pytest.mark.asyncio
+    async def test_failed_claim_hands_task_back(self, async_queue, redis, monkeypatch):
+        """Test that a claim error after BLMOVE returns the task to pending"""
+        async def empty_queue(**kwargs):
+            return None
+        async def broken_claim(**kwargs):
+            raise ConnectionError("lost")
+        monkeypatch.setattr(q, "_async_dispatch_script", empty_queue)
+        monkeypatch.setattr(q, "_async_claim_script", broken_claim)
+        ids = [_task_id() for _ in range(2)]
+        for tid in ids:
+            await q.enqueue_task_async(tid, {})
+
+        with pytest.raises(ConnectionError):
+            await q.claim_next_task_async("worker", timeout=1)
+
+        assert redis.llen("queue:processing:worker") == 0
+        assert redis.lrange("queue:pending", 0, -1) == ids[::-1]
+        assert redis.zcard("queue:processing") == 0
+        assert_index_in_sync(redis)
+
+    def test_recover_handoffs_waits_a_sweep(self, queue, redis):
+        """Test that stranded handoff tasks are returned only when seen on two sweeps"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        redis.lmove("queue:pending", "queue:processing:worker", "RIGHT", "LEFT")
+
+        returned, seen = queue.recover_handoffs({})
+        assert returned == 0
+        assert seen == {"queue:processing:worker": [tid]}
+
+        returned, seen = queue.recover_handoffs(seen)
+        assert returned == 1
+        assert seen == {}
+        assert redis.lrange("queue:pending", 0, -1) == [tid]
+        assert queue.get_pending_position(tid) == 1
+        assert queue.claim_next_task("worker")["task_id"] == tid
+
+    def test_claim_after_recovery_is_noop(self, queue, redis):
+        """Test that CLAIM_TASK_LUA ignores a task the janitor already returned"""
+        tid = _task_id()
+        queue.enqueue_task(tid, {})
+        redis.lmove("queue:pending", "queue:processing:worker", "RIGHT", "LEFT")
+        _, seen = queue.recover_handoffs({})
+        queue.recover_handoffs(seen)
+
+        claim = redis.register_script(q.CLAIM_TASK_LUA)
+        flat = claim(
+            keys=["queue:processing:worker", "queue:pending:idx", "queue:processing", f"task:{tid}"],
+            args=[tid, time.time(), "now", "worker"],
+        )
+
+        assert flat == []
+        assert redis.zcard("queue:processing") == 0
+        assert queue.get_pending_position(tid) == 1
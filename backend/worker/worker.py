@@ -24,6 +24,7 @@ WORKER_TOKEN = os.getenv("WORKER_TOKEN")
 WORKER_ID = os.getenv("WORKER_ID", "unknown")
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "5"))  # seconds
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))  # seconds
+LONG_POLL_TIMEOUT = int(os.getenv("LONG_POLL_TIMEOUT", "40"))  # seconds; must exceed the server's TASK_POLL_TIMEOUT_SECONDS
 
 if not WORKER_TOKEN:
     logger.error("WORKER_TOKEN environment variable is required")
@@ -42,9 +43,9 @@ class WorkerAPIClient:
         }
     
     async def get_next_task(self) -> Optional[Dict[str, Any]]:
-        """Poll server for next available task."""
+        """Long-poll server for next available task (server holds the request until one arrives)."""
         try:
-            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+            async with httpx.AsyncClient(timeout=LONG_POLL_TIMEOUT) as client:
                 response = await client.get(
                     f"{self.server_url}/api/v1/worker/tasks/next",
                     headers=self.headers
@@ -55,10 +56,11 @@ class WorkerAPIClient:
                 return response.json()
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error getting next task: {e.response.status_code}")
-            return None
         except Exception as e:
             logger.error(f"Error getting next task: {e}")
-            return None
+        # Back off before retrying after an error
+        await asyncio.sleep(POLL_INTERVAL)
+        return None
     
     async def update_task_status(self, task_id: str, status: str, **kwargs) -> bool:
         """Update task status on server."""
@@ -173,8 +175,7 @@ async def worker_loop():
             task = await api_client.get_next_task()
             
             if not task:
-                # No tasks available, wait before polling again
-                await asyncio.sleep(POLL_INTERVAL)
+                # Long poll timed out (or errored and backed off); poll again
                 continue
             
             task_id = task.get("task_id")